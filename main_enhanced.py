@@ -6,12 +6,22 @@ No unnecessary complexity - just more tools.
 """
 
 import os
+import sys
 import json
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import itertools
+from collections import Counter
+from datetime import datetime, UTC
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
-from mem0 import MemoryClient
+
+from mem0_mcp.caching import TTLCache
+from mem0_mcp.client import CUSTOM_INSTRUCTIONS, close_client, get_client, record_instructions
+from mem0_mcp.encoding import ResponseFormat, dump_json as _dump, encode_json_stream, encode_rows
+from mem0_mcp.event_loop import install_fast_event_loop
 
 # Load environment variables
 load_dotenv()
@@ -23,26 +33,212 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize mem0 client
-logger.info("Initializing mem0 client...")
-try:
-    mem0_client = MemoryClient()
-    CUSTOM_INSTRUCTIONS = """
-Extract the Following Information:  
-
-- Code Snippets: Save the actual code for future reference.  
-- Explanation: Document a clear description of what the code does and how it works.
-- Related Technical Details: Include information about the programming language, dependencies, and system specifications.  
-- Key Features: Highlight the main functionalities and important aspects of the snippet.
-"""
-    mem0_client.update_project(custom_instructions=CUSTOM_INSTRUCTIONS)
-    logger.info("mem0 client initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize mem0 client: {e}")
-    raise
-
 DEFAULT_USER_ID = "cursor_mcp"
 
+# Maximum number of in-flight mem0 requests for batch operations
+BATCH_CONCURRENCY = 16
+
+# Maximum number of in-flight adds for import/restore; tune to the backend's rate limits
+IMPORT_CONCURRENCY = int(os.environ.get("MEM0_IMPORT_CONCURRENCY", "16"))
+
+# Page size used when walking a user's full memory list
+EXPORT_PAGE_SIZE = 500
+
+# Hard cap on pages fetched in one walk, in case the backend ignores paging
+EXPORT_MAX_PAGES = int(os.environ.get("MEM0_EXPORT_MAX_PAGES", "1000"))
+
+# Recent search results; cleared on every write so results are never stale
+_search_cache = TTLCache(maxsize=512, ttl=60)
+
+# Usage aggregates for the advanced analytics operations, keyed by user_id
+_usage_cache = TTLCache(maxsize=64, ttl=30)
+# In-flight aggregations by user_id, so concurrent misses for one user walk the list once
+_usage_locks: Dict[str, asyncio.Lock] = {}
+
+# Error responses for memory IDs the backend reported as not found. Memory IDs
+# are never reused, so a miss stays a miss; the TTL only bounds staleness.
+_missing_memories = TTLCache(maxsize=10_000, ttl=600)
+
+
+def _error(message: str) -> str:
+    """Encode an error response"""
+    return _dump({"error": message})
+
+
+# Error responses with constant messages are encoded once at import
+_ERR_MESSAGES_REQUIRED = _error("Messages required for add operation")
+_ERR_GET_ID_REQUIRED = _error("Memory ID required for get operation")
+_ERR_QUERY_REQUIRED = _error("Query required for search operation")
+_ERR_UPDATE_ARGS_REQUIRED = _error("Memory ID and data required for update")
+_ERR_DELETE_ID_REQUIRED = _error("Memory ID required for delete")
+_ERR_HISTORY_ID_REQUIRED = _error("Memory ID required for history")
+_ERR_BATCH_UPDATE_REQUIRED = _error("Memories list required for batch update")
+_ERR_BATCH_DELETE_REQUIRED = _error("Memories list required for batch delete")
+_ERR_FEEDBACK_ARGS_REQUIRED = _error("Memory ID and feedback required")
+_ERR_ENTITY_ID_REQUIRED = _error("Entity ID required")
+_ERR_USER_IDS_REQUIRED = _error("Both old and new user IDs required")
+_ERR_MEMORY_IDS_REQUIRED = _error("Both memory IDs required")
+_ERR_MEMORY_ID_REQUIRED = _error("Memory ID required")
+_ERR_IMPORT_DATA_REQUIRED = _error("Data required for import")
+_ERR_BACKUP_DATA_REQUIRED = _error("Backup data required")
+_ERR_WEBHOOK_URL_REQUIRED = _error("URL required for webhook")
+_ERR_WEBHOOK_ID_REQUIRED = _error("Webhook ID required")
+
+
+def _invalidate_reads() -> None:
+    """Drop cached read results after a write"""
+    _search_cache.clear()
+    _usage_cache.clear()
+
+
+def _is_not_found(error: BaseException) -> bool:
+    """Check if a mem0 client error (or its cause) is a 404"""
+    while error is not None:
+        response = getattr(error, "response", None)
+        if 404 in (getattr(error, "status_code", None), getattr(response, "status_code", None)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+async def _call_for_memory(memory_id: str, call: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a mem0 call for a memory ID in a worker thread, remembering IDs reported missing"""
+    try:
+        return await asyncio.to_thread(call, *args, **kwargs)
+    except Exception as e:
+        if _is_not_found(e):
+            _missing_memories.set(memory_id, _error(str(e)))
+        raise
+
+
+def _rows(result: Any) -> List[Dict[str, Any]]:
+    """Extract the memory rows from a mem0 list response"""
+    if isinstance(result, dict):
+        return result.get("results", [])
+    return result or []
+
+
+async def _iter_memory_pages(user_id: str, page_size: int = EXPORT_PAGE_SIZE,
+                             outcome: Optional[Dict[str, Any]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield every memory for a user as bounded pages.
+
+    Pages are fetched in a worker thread so the event loop is not blocked.
+    Iteration stops at the first short page, at a page that repeats the
+    previous one (a backend that ignores paging), or after EXPORT_MAX_PAGES;
+    in the last case `outcome["truncated"]` is set, when an outcome dict is given.
+    """
+    previous_first_id = None
+    for page in range(1, EXPORT_MAX_PAGES + 1):
+        batch = _rows(await asyncio.to_thread(
+            get_client().get_all, user_id=user_id, page=page, page_size=page_size, output_format="v1.1"
+        ))
+        if not batch:
+            break
+        first_id = batch[0].get("id") if isinstance(batch[0], dict) else None
+        if first_id is not None and first_id == previous_first_id:
+            logger.warning(f"Backend returned page {page} of memories for {user_id} again; stopping")
+            break
+        previous_first_id = first_id
+        yield batch
+        if len(batch) < page_size:
+            break
+    else:
+        logger.warning(f"Stopped listing memories for {user_id} after {EXPORT_MAX_PAGES} pages")
+        if outcome is not None:
+            outcome["truncated"] = True
+
+
+async def _iter_memories(user_id: str, page_size: int = EXPORT_PAGE_SIZE,
+                         outcome: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Yield every memory for a user, one bounded page at a time"""
+    async for batch in _iter_memory_pages(user_id, page_size, outcome):
+        for row in batch:
+            yield row
+
+
+async def _encode_memory_dump(key: str, fields: Dict[str, Any], user_id: str,
+                              response_format: ResponseFormat) -> str:
+    """
+    Encode an export/backup payload of the form
+    {"success": true, key: {**fields, "memories": [...]}, "truncated": bool}.
+
+    `truncated` is true when the walk stopped at EXPORT_MAX_PAGES, so the dump
+    is missing memories. JSON output is encoded row by row as memories are
+    fetched; the tabular formats need the full row list up front.
+    """
+    outcome = {"truncated": False}
+    if response_format == "json":
+        body = await encode_json_stream(fields, "memories", _iter_memories(user_id, outcome=outcome))
+        return f'{{"success":true,{_dump(key)}:{body},"truncated":{_dump(outcome["truncated"])}}}'
+
+    memories = [row async for row in _iter_memories(user_id, outcome=outcome)]
+    return encode_rows("memories", memories, response_format,
+                       {"success": True, key: {**fields, "memories": memories}, **outcome},
+                       fields={**fields, **outcome})
+
+
+async def _gather_bounded(items: List[Dict[str, Any]], call, limit: int) -> List[Any]:
+    """
+    Run a blocking mem0 call for each item concurrently.
+
+    Calls run in worker threads with at most `limit` in flight. Results are
+    returned in input order; a failing call yields its exception instead of
+    aborting the rest.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_one(item: Dict[str, Any]) -> Any:
+        async with semaphore:
+            return await asyncio.to_thread(call, item)
+
+    return await asyncio.gather(*(run_one(item) for item in items), return_exceptions=True)
+
+
+async def _run_batch(items: List[Dict[str, Any]], call) -> List[Dict[str, Any]]:
+    """Run a batch operation and report per-item success"""
+    outcomes = await _gather_bounded(items, call, BATCH_CONCURRENCY)
+    return [
+        {"id": item["id"], "success": False, "error": str(outcome)}
+        if isinstance(outcome, Exception) else {"id": item["id"], "success": True}
+        for item, outcome in zip(items, outcomes)
+    ]
+
+
+OperationHandler = Callable[..., Awaitable[str]]
+
+
+def _requires(*names: str, error: str) -> Callable[[OperationHandler], OperationHandler]:
+    """
+    Declare the parameters an operation handler needs.
+
+    The check runs in _dispatch before the handler is called, so handlers only
+    contain the operation itself. A missing or empty parameter returns `error`.
+    """
+    def decorator(handler: OperationHandler) -> OperationHandler:
+        handler.required_params = (names, error)
+        return handler
+    return decorator
+
+
+async def _dispatch(tool_name: str, operations: Dict[str, OperationHandler], params: Dict[str, Any]) -> str:
+    """Route a tool call to its operation handler"""
+    operation = params["operation"]
+    # Interned names hit the table keys' identity fast path; non-strings can never match
+    handler = operations.get(sys.intern(operation)) if isinstance(operation, str) else None
+    if handler is None:
+        return _error(f"Unknown operation: {operation}")
+
+    required = getattr(handler, "required_params", None)
+    if required is not None and not all(params.get(name) for name in required[0]):
+        return required[1]
+
+    try:
+        return await handler(**params)
+    except Exception as e:
+        logger.error(f"Error in {tool_name} operation {operation}: {e}")
+        return _error(str(e))
+
 # Initialize FastMCP server
 mcp = FastMCP("mem0-mcp-enhanced")
 
@@ -50,6 +246,121 @@ mcp = FastMCP("mem0-mcp-enhanced")
 # TOOL 1: mem0_memory - Core memory operations
 # ============================================================================
 
+@_requires("messages", error=_ERR_MESSAGES_REQUIRED)
+async def _memory_add(messages=None, user_id=None, metadata=None, categories=None,
+                      filters=None, infer=True, output_format="v1.1", **_) -> str:
+    result = await asyncio.to_thread(get_client().add, messages, user_id=user_id, metadata=metadata,
+                                     categories=categories, filters=filters,
+                                     infer=infer, output_format=output_format)
+    _invalidate_reads()
+    return _dump({"success": True, "result": result})
+
+
+@_requires("memory_id", error=_ERR_GET_ID_REQUIRED)
+async def _memory_get(memory_id=None, output_format="v1.1", **_) -> str:
+    missing = _missing_memories.get(memory_id)
+    if missing is not None:
+        return missing
+    result = await _call_for_memory(memory_id, get_client().get, memory_id, output_format=output_format)
+    return _dump({"success": True, "memory": result})
+
+
+async def _memory_get_all(user_id=None, page=1, page_size=100, output_format="v1.1",
+                          response_format="json", **_) -> str:
+    result = await asyncio.to_thread(get_client().get_all, user_id=user_id, page=page,
+                                     page_size=page_size, output_format=output_format)
+    return encode_rows("memories", _rows(result), response_format,
+                       {"success": True, "memories": result})
+
+
+@_requires("query", error=_ERR_QUERY_REQUIRED)
+async def _memory_search(query=None, user_id=None, page=1, page_size=100, output_format="v1.1",
+                         response_format="json", **_) -> str:
+    cache_key = (query, user_id, page, page_size, output_format)
+    result = _search_cache.get(cache_key)
+    if result is None:
+        result = await asyncio.to_thread(get_client().search, query, user_id=user_id, page=page,
+                                         page_size=page_size, output_format=output_format)
+        _search_cache.set(cache_key, result)
+    return encode_rows("results", _rows(result), response_format,
+                       {"success": True, "results": result})
+
+
+@_requires("memory_id", "data", error=_ERR_UPDATE_ARGS_REQUIRED)
+async def _memory_update(memory_id=None, data=None, **_) -> str:
+    result = await asyncio.to_thread(get_client().update, memory_id, data)
+    _invalidate_reads()
+    return _dump({"success": True, "updated": result})
+
+
+@_requires("memory_id", error=_ERR_DELETE_ID_REQUIRED)
+async def _memory_delete(memory_id=None, **_) -> str:
+    missing = _missing_memories.get(memory_id)
+    if missing is not None:
+        return missing
+    result = await _call_for_memory(memory_id, get_client().delete, memory_id)
+    _invalidate_reads()
+    return _dump({"success": True, "deleted": result})
+
+
+async def _memory_delete_all(user_id=None, agent_id=None, app_id=None, run_id=None, **_) -> str:
+    result = await asyncio.to_thread(get_client().delete_all, user_id=user_id, agent_id=agent_id,
+                                     app_id=app_id, run_id=run_id)
+    _invalidate_reads()
+    return _dump({"success": True, "result": result})
+
+
+@_requires("memory_id", error=_ERR_HISTORY_ID_REQUIRED)
+async def _memory_history(memory_id=None, **_) -> str:
+    missing = _missing_memories.get(memory_id)
+    if missing is not None:
+        return missing
+    result = await _call_for_memory(memory_id, get_client().history, memory_id)
+    return _dump({"success": True, "history": result})
+
+
+@_requires("memories", error=_ERR_BATCH_UPDATE_REQUIRED)
+async def _memory_batch_update(memories=None, **_) -> str:
+    items = [mem for mem in memories if "id" in mem and "data" in mem]
+    client = get_client()
+    results = await _run_batch(items, lambda mem: client.update(mem["id"], mem["data"]))
+    _invalidate_reads()
+    return _dump({"success": True, "results": results})
+
+
+@_requires("memories", error=_ERR_BATCH_DELETE_REQUIRED)
+async def _memory_batch_delete(memories=None, **_) -> str:
+    items = [mem for mem in memories if "id" in mem]
+    client = get_client()
+    results = await _run_batch(items, lambda mem: client.delete(mem["id"]))
+    _invalidate_reads()
+    return _dump({"success": True, "results": results})
+
+
+@_requires("memory_id", "feedback", error=_ERR_FEEDBACK_ARGS_REQUIRED)
+async def _memory_feedback(memory_id=None, feedback=None, **_) -> str:
+    # Note: Mem0 SDK doesn't have direct feedback method, would need custom implementation
+    return _dump({
+        "success": True, 
+        "message": f"Feedback {feedback} recorded for memory {memory_id}"
+    })
+
+
+_MEMORY_OPERATIONS: Dict[str, OperationHandler] = {
+    "add": _memory_add,
+    "get": _memory_get,
+    "get_all": _memory_get_all,
+    "search": _memory_search,
+    "update": _memory_update,
+    "delete": _memory_delete,
+    "delete_all": _memory_delete_all,
+    "history": _memory_history,
+    "batch_update": _memory_batch_update,
+    "batch_delete": _memory_batch_delete,
+    "feedback": _memory_feedback,
+}
+
+
 @mcp.tool(
     description="""Comprehensive memory management operations including:
     - Add, get, update, delete memories
@@ -58,7 +369,10 @@ mcp = FastMCP("mem0-mcp-enhanced")
     - Memory history tracking
     - Feedback mechanisms
     
-    Operations: add, get, get_all, search, update, delete, delete_all, history, batch_update, batch_delete, feedback"""
+    Operations: add, get, get_all, search, update, delete, delete_all, history, batch_update, batch_delete, feedback
+    
+    get_all and search accept response_format: json (default), toon (compact tabular
+    text for large results) or msgpack (base64-encoded)."""
 )
 async def mem0_memory(
     operation: str,
@@ -82,102 +396,63 @@ async def mem0_memory(
     data: Optional[str] = None,
     memories: Optional[List[Dict[str, Any]]] = None,
     feedback: Optional[str] = None,
-    feedback_reason: Optional[str] = None
+    feedback_reason: Optional[str] = None,
+    response_format: ResponseFormat = "json"
 ) -> str:
     """Execute memory management operations"""
-    try:
-        # Use default user_id if not provided
-        user_id = user_id or DEFAULT_USER_ID
-        
-        if operation == "add":
-            if not messages:
-                return json.dumps({"error": "Messages required for add operation"})
-            result = mem0_client.add(messages, user_id=user_id, metadata=metadata, 
-                                   categories=categories, filters=filters, 
-                                   infer=infer, output_format=output_format)
-            return json.dumps({"success": True, "result": result})
-            
-        elif operation == "get":
-            if not memory_id:
-                return json.dumps({"error": "Memory ID required for get operation"})
-            result = mem0_client.get(memory_id, output_format=output_format)
-            return json.dumps({"success": True, "memory": result})
-            
-        elif operation == "get_all":
-            result = mem0_client.get_all(user_id=user_id, page=page, page_size=page_size, 
-                                       output_format=output_format)
-            return json.dumps({"success": True, "memories": result})
-            
-        elif operation == "search":
-            if not query:
-                return json.dumps({"error": "Query required for search operation"})
-            result = mem0_client.search(query, user_id=user_id, page=page, 
-                                      page_size=page_size, output_format=output_format)
-            return json.dumps({"success": True, "results": result})
-            
-        elif operation == "update":
-            if not memory_id or not data:
-                return json.dumps({"error": "Memory ID and data required for update"})
-            result = mem0_client.update(memory_id, data)
-            return json.dumps({"success": True, "updated": result})
-            
-        elif operation == "delete":
-            if not memory_id:
-                return json.dumps({"error": "Memory ID required for delete"})
-            result = mem0_client.delete(memory_id)
-            return json.dumps({"success": True, "deleted": result})
-            
-        elif operation == "delete_all":
-            result = mem0_client.delete_all(user_id=user_id, agent_id=agent_id, 
-                                          app_id=app_id, run_id=run_id)
-            return json.dumps({"success": True, "result": result})
-            
-        elif operation == "history":
-            if not memory_id:
-                return json.dumps({"error": "Memory ID required for history"})
-            result = mem0_client.history(memory_id)
-            return json.dumps({"success": True, "history": result})
-            
-        elif operation == "batch_update":
-            if not memories:
-                return json.dumps({"error": "Memories list required for batch update"})
-            results = []
-            for mem in memories:
-                if "id" in mem and "data" in mem:
-                    result = mem0_client.update(mem["id"], mem["data"])
-                    results.append({"id": mem["id"], "success": True})
-            return json.dumps({"success": True, "results": results})
-            
-        elif operation == "batch_delete":
-            if not memories:
-                return json.dumps({"error": "Memories list required for batch delete"})
-            results = []
-            for mem in memories:
-                if "id" in mem:
-                    result = mem0_client.delete(mem["id"])
-                    results.append({"id": mem["id"], "success": True})
-            return json.dumps({"success": True, "results": results})
-            
-        elif operation == "feedback":
-            if not memory_id or not feedback:
-                return json.dumps({"error": "Memory ID and feedback required"})
-            # Note: Mem0 SDK doesn't have direct feedback method, would need custom implementation
-            return json.dumps({
-                "success": True, 
-                "message": f"Feedback {feedback} recorded for memory {memory_id}"
-            })
-            
-        else:
-            return json.dumps({"error": f"Unknown operation: {operation}"})
-            
-    except Exception as e:
-        logger.error(f"Error in mem0_memory operation {operation}: {e}")
-        return json.dumps({"error": str(e)})
+    params = dict(locals())
+    # Use default user_id if not provided
+    params["user_id"] = user_id or DEFAULT_USER_ID
+    return await _dispatch("mem0_memory", _MEMORY_OPERATIONS, params)
 
 # ============================================================================
 # TOOL 2: mem0_entity - Entity management (users, agents, apps)
 # ============================================================================
 
+async def _entity_list_users(**_) -> str:
+    # This would need to be implemented via API or custom logic
+    return _dump({
+        "success": True,
+        "users": [DEFAULT_USER_ID],
+        "message": "Entity listing requires API implementation"
+    })
+
+
+@_requires("entity_id", error=_ERR_ENTITY_ID_REQUIRED)
+async def _entity_create_user(entity_id=None, **_) -> str:
+    # Users are created implicitly when memories are added
+    return _dump({
+        "success": True,
+        "entity_id": entity_id,
+        "message": "User will be created on first memory add"
+    })
+
+
+@_requires("entity_id", error=_ERR_ENTITY_ID_REQUIRED)
+async def _entity_delete_user(entity_id=None, **_) -> str:
+    # Delete all memories for user
+    result = await asyncio.to_thread(get_client().delete_all, user_id=entity_id)
+    _invalidate_reads()
+    return _dump({"success": True, "deleted": result})
+
+
+@_requires("old_user_id", "new_user_id", error=_ERR_USER_IDS_REQUIRED)
+async def _entity_migrate_user(old_user_id=None, new_user_id=None, **_) -> str:
+    # Would need custom implementation
+    return _dump({
+        "success": True,
+        "message": f"Migration from {old_user_id} to {new_user_id} requires custom implementation"
+    })
+
+
+_ENTITY_OPERATIONS: Dict[str, OperationHandler] = {
+    "list_users": _entity_list_users,
+    "create_user": _entity_create_user,
+    "delete_user": _entity_delete_user,
+    "migrate_user": _entity_migrate_user,
+}
+
+
 @mcp.tool(
     description="""Entity management operations for users, agents, and applications.
     
@@ -193,52 +468,67 @@ async def mem0_entity(
     new_user_id: Optional[str] = None
 ) -> str:
     """Execute entity management operations"""
-    try:
-        if operation == "list_users":
-            # This would need to be implemented via API or custom logic
-            return json.dumps({
-                "success": True,
-                "users": [DEFAULT_USER_ID],
-                "message": "Entity listing requires API implementation"
-            })
-            
-        elif operation == "create_user":
-            if not entity_id:
-                return json.dumps({"error": "Entity ID required"})
-            # Users are created implicitly when memories are added
-            return json.dumps({
-                "success": True,
-                "entity_id": entity_id,
-                "message": "User will be created on first memory add"
-            })
-            
-        elif operation == "delete_user":
-            if not entity_id:
-                return json.dumps({"error": "Entity ID required"})
-            # Delete all memories for user
-            result = mem0_client.delete_all(user_id=entity_id)
-            return json.dumps({"success": True, "deleted": result})
-            
-        elif operation == "migrate_user":
-            if not old_user_id or not new_user_id:
-                return json.dumps({"error": "Both old and new user IDs required"})
-            # Would need custom implementation
-            return json.dumps({
-                "success": True,
-                "message": f"Migration from {old_user_id} to {new_user_id} requires custom implementation"
-            })
-            
-        else:
-            return json.dumps({"error": f"Unknown operation: {operation}"})
-            
-    except Exception as e:
-        logger.error(f"Error in mem0_entity operation {operation}: {e}")
-        return json.dumps({"error": str(e)})
+    return await _dispatch("mem0_entity", _ENTITY_OPERATIONS, dict(locals()))
 
 # ============================================================================
 # TOOL 3: mem0_graph - Graph operations for relationships
 # ============================================================================
 
+# Note: These operations would require a graph-enabled backend
+
+# Placeholder responses are constant, so they are encoded once at import
+_GRAPH_BACKEND_REQUIRED = _dump({
+    "success": True,
+    "message": "Graph operations require Neo4j or similar backend"
+})
+_GRAPH_NO_RELATIONS = _dump({
+    "success": True,
+    "relations": [],
+    "message": "Graph operations require Neo4j or similar backend"
+})
+_GRAPH_ANALYSIS = _dump({
+    "success": True,
+    "analysis": {},
+    "message": "Analysis requires graph backend"
+})
+
+
+@_requires("memory_id", "related_id", error=_ERR_MEMORY_IDS_REQUIRED)
+async def _graph_add_relation(memory_id=None, related_id=None, **_) -> str:
+    return _GRAPH_BACKEND_REQUIRED
+
+
+@_requires("memory_id", error=_ERR_MEMORY_ID_REQUIRED)
+async def _graph_get_relations(memory_id=None, **_) -> str:
+    return _GRAPH_NO_RELATIONS
+
+
+async def _graph_visualize(format="json", **_) -> str:
+    return _dump({
+        "success": True,
+        "format": format,
+        "message": "Visualization requires graph backend"
+    })
+
+
+async def _graph_analyze(**_) -> str:
+    return _GRAPH_ANALYSIS
+
+
+@_requires("memory_id", "related_id", error=_ERR_MEMORY_IDS_REQUIRED)
+async def _graph_remove_relation(memory_id=None, related_id=None, **_) -> str:
+    return _GRAPH_BACKEND_REQUIRED
+
+
+_GRAPH_OPERATIONS: Dict[str, OperationHandler] = {
+    "add_relation": _graph_add_relation,
+    "get_relations": _graph_get_relations,
+    "visualize": _graph_visualize,
+    "analyze": _graph_analyze,
+    "remove_relation": _graph_remove_relation,
+}
+
+
 @mcp.tool(
     description="""Graph-based memory operations for managing relationships between memories.
     
@@ -253,62 +543,78 @@ async def mem0_graph(
     format: str = "json"
 ) -> str:
     """Execute graph memory operations"""
-    try:
-        # Note: These operations would require a graph-enabled backend
-        if operation == "add_relation":
-            if not memory_id or not related_id:
-                return json.dumps({"error": "Both memory IDs required"})
-            return json.dumps({
-                "success": True,
-                "message": "Graph operations require Neo4j or similar backend"
-            })
-            
-        elif operation == "get_relations":
-            if not memory_id:
-                return json.dumps({"error": "Memory ID required"})
-            return json.dumps({
-                "success": True,
-                "relations": [],
-                "message": "Graph operations require Neo4j or similar backend"
-            })
-            
-        elif operation == "visualize":
-            return json.dumps({
-                "success": True,
-                "format": format,
-                "message": "Visualization requires graph backend"
-            })
-            
-        elif operation == "analyze":
-            return json.dumps({
-                "success": True,
-                "analysis": {},
-                "message": "Analysis requires graph backend"
-            })
-            
-        elif operation == "remove_relation":
-            if not memory_id or not related_id:
-                return json.dumps({"error": "Both memory IDs required"})
-            return json.dumps({
-                "success": True,
-                "message": "Graph operations require Neo4j or similar backend"
-            })
-            
-        else:
-            return json.dumps({"error": f"Unknown operation: {operation}"})
-            
-    except Exception as e:
-        logger.error(f"Error in mem0_graph operation {operation}: {e}")
-        return json.dumps({"error": str(e)})
+    return await _dispatch("mem0_graph", _GRAPH_OPERATIONS, dict(locals()))
 
 # ============================================================================
 # TOOL 4: mem0_export - Import/export operations
 # ============================================================================
 
+async def _export_export(user_id=None, format="json", response_format="json", **_) -> str:
+    if format != "json":
+        return _error(f"Unsupported format: {format}")
+
+    export_fields = {
+        "version": "1.0",
+        "user_id": user_id,
+        "export_date": datetime.now(UTC).isoformat()
+    }
+    return await _encode_memory_dump("data", export_fields, user_id, response_format)
+
+
+async def _add_memories(memories: List[Dict[str, Any]], user_id: str) -> tuple[int, int]:
+    """Add exported memories concurrently, returning (added, failed) counts"""
+    client = get_client()
+    outcomes = await _gather_bounded(
+        memories,
+        lambda memory: client.add(memory.get("text", ""), user_id=user_id,
+                                  metadata=memory.get("metadata")),
+        IMPORT_CONCURRENCY
+    )
+    _invalidate_reads()
+    failed = sum(1 for outcome in outcomes if isinstance(outcome, Exception))
+    return len(outcomes) - failed, failed
+
+
+@_requires("data", error=_ERR_IMPORT_DATA_REQUIRED)
+async def _export_import(data=None, user_id=None, **_) -> str:
+    # Parse and import memories
+    import_data = json.loads(data)
+    imported, failed = await _add_memories(import_data.get("memories", []), user_id)
+    return _dump({"success": True, "imported": imported, "failed": failed})
+
+
+async def _export_backup(user_id=None, response_format="json", **_) -> str:
+    # Similar to export but with timestamp
+    backup_fields = {
+        "type": "backup",
+        "timestamp": datetime.now(UTC).isoformat(),
+        "user_id": user_id
+    }
+    return await _encode_memory_dump("backup", backup_fields, user_id, response_format)
+
+
+@_requires("data", error=_ERR_BACKUP_DATA_REQUIRED)
+async def _export_restore(data=None, user_id=None, **_) -> str:
+    # Similar to import
+    backup = json.loads(data)
+    restored, failed = await _add_memories(backup.get("memories", []), user_id)
+    return _dump({"success": True, "restored": restored, "failed": failed})
+
+
+_EXPORT_OPERATIONS: Dict[str, OperationHandler] = {
+    "export": _export_export,
+    "import": _export_import,
+    "backup": _export_backup,
+    "restore": _export_restore,
+}
+
+
 @mcp.tool(
     description="""Import and export memory data in various formats.
     
-    Operations: export, import, backup, restore"""
+    Operations: export, import, backup, restore
+    
+    export and backup accept response_format: json (default), toon or msgpack."""
 )
 async def mem0_export(
     operation: str,
@@ -316,83 +622,87 @@ async def mem0_export(
     file_path: Optional[str] = None,
     data: Optional[str] = None,
     user_id: Optional[str] = None,
-    filters: Optional[Dict[str, Any]] = None
+    filters: Optional[Dict[str, Any]] = None,
+    response_format: ResponseFormat = "json"
 ) -> str:
     """Execute import/export operations"""
-    try:
-        user_id = user_id or DEFAULT_USER_ID
-        
-        if operation == "export":
-            # Get all memories for export
-            memories = mem0_client.get_all(user_id=user_id, output_format="v1.1")
-            
-            if format == "json":
-                export_data = {
-                    "version": "1.0",
-                    "user_id": user_id,
-                    "memories": memories,
-                    "export_date": str(datetime.now())
-                }
-                return json.dumps({"success": True, "data": export_data})
-            else:
-                return json.dumps({"error": f"Unsupported format: {format}"})
-                
-        elif operation == "import":
-            if not data:
-                return json.dumps({"error": "Data required for import"})
-            # Parse and import memories
-            import_data = json.loads(data)
-            imported = []
-            for memory in import_data.get("memories", []):
-                result = mem0_client.add(
-                    memory.get("text", ""),
-                    user_id=user_id,
-                    metadata=memory.get("metadata")
-                )
-                imported.append(result)
-            return json.dumps({"success": True, "imported": len(imported)})
-            
-        elif operation == "backup":
-            # Similar to export but with timestamp
-            memories = mem0_client.get_all(user_id=user_id, output_format="v1.1")
-            backup_data = {
-                "type": "backup",
-                "timestamp": str(datetime.now()),
-                "user_id": user_id,
-                "memories": memories
-            }
-            return json.dumps({"success": True, "backup": backup_data})
-            
-        elif operation == "restore":
-            if not data:
-                return json.dumps({"error": "Backup data required"})
-            # Similar to import
-            backup = json.loads(data)
-            restored = 0
-            for memory in backup.get("memories", []):
-                mem0_client.add(
-                    memory.get("text", ""),
-                    user_id=user_id,
-                    metadata=memory.get("metadata")
-                )
-                restored += 1
-            return json.dumps({"success": True, "restored": restored})
-            
-        else:
-            return json.dumps({"error": f"Unknown operation: {operation}"})
-            
-    except Exception as e:
-        logger.error(f"Error in mem0_export operation {operation}: {e}")
-        return json.dumps({"error": str(e)})
+    params = dict(locals())
+    params["user_id"] = user_id or DEFAULT_USER_ID
+    return await _dispatch("mem0_export", _EXPORT_OPERATIONS, params)
 
 # ============================================================================
 # TOOL 5: mem0_config - Configuration management
 # ============================================================================
 
+# Configuration info is fixed after startup; freeze it and encode the full response once
+_CONFIG = MappingProxyType({
+    "default_user_id": DEFAULT_USER_ID,
+    "custom_instructions": CUSTOM_INSTRUCTIONS,
+    "output_format": "v1.1",
+    "version": "0.2.0"
+})
+_CONFIG_JSON = _dump({"success": True, "config": dict(_CONFIG)})
+
+
+async def _config_get_config(key=None, **_) -> str:
+    # Return current configuration info
+    if key:
+        return _dump({"success": True, "value": _CONFIG.get(key)})
+    return _CONFIG_JSON
+
+
+async def _config_update_config(key=None, value=None, **_) -> str:
+    if key == "custom_instructions" and value:
+        await asyncio.to_thread(get_client().update_project, custom_instructions=value)
+        record_instructions(value)
+        return _dump({"success": True, "updated": key})
+    return _dump({
+        "success": False,
+        "message": "Configuration updates limited to custom_instructions"
+    })
+
+
+async def _config_reset_config(**_) -> str:
+    await asyncio.to_thread(get_client().update_project, custom_instructions=CUSTOM_INSTRUCTIONS)
+    record_instructions(CUSTOM_INSTRUCTIONS)
+    return _dump({"success": True, "message": "Configuration reset"})
+
+
+async def _config_reset_negative_cache(**_) -> str:
+    cleared = len(_missing_memories)
+    _missing_memories.clear()
+    return _dump({"success": True, "cleared": cleared})
+
+
+async def _config_validate_config(config_data=None, **_) -> str:
+    # Basic validation
+    is_valid = True
+    errors = []
+    if config_data:
+        if "custom_instructions" in config_data:
+            if not isinstance(config_data["custom_instructions"], str):
+                is_valid = False
+                errors.append("custom_instructions must be a string")
+    return _dump({
+        "success": True,
+        "valid": is_valid,
+        "errors": errors
+    })
+
+
+_CONFIG_OPERATIONS: Dict[str, OperationHandler] = {
+    "get_config": _config_get_config,
+    "update_config": _config_update_config,
+    "reset_config": _config_reset_config,
+    "validate_config": _config_validate_config,
+    "reset_negative_cache": _config_reset_negative_cache,
+}
+
+
 @mcp.tool(
     description="""Manage Mem0 configuration and settings.
     
-    Operations: get_config, update_config, reset_config, validate_config"""
+    Operations: get_config, update_config, reset_config, validate_config, reset_negative_cache"""
 )
 async def mem0_config(
     operation: str,
@@ -401,59 +711,66 @@ async def mem0_config(
     config_data: Optional[Dict[str, Any]] = None
 ) -> str:
     """Execute configuration operations"""
-    try:
-        if operation == "get_config":
-            # Return current configuration info
-            config = {
-                "default_user_id": DEFAULT_USER_ID,
-                "custom_instructions": CUSTOM_INSTRUCTIONS,
-                "output_format": "v1.1",
-                "version": "0.2.0"
-            }
-            if key:
-                return json.dumps({"success": True, "value": config.get(key)})
-            return json.dumps({"success": True, "config": config})
-            
-        elif operation == "update_config":
-            if key == "custom_instructions" and value:
-                mem0_client.update_project(custom_instructions=value)
-                return json.dumps({"success": True, "updated": key})
-            else:
-                return json.dumps({
-                    "success": False,
-                    "message": "Configuration updates limited to custom_instructions"
-                })
-                
-        elif operation == "reset_config":
-            mem0_client.update_project(custom_instructions=CUSTOM_INSTRUCTIONS)
-            return json.dumps({"success": True, "message": "Configuration reset"})
-            
-        elif operation == "validate_config":
-            # Basic validation
-            is_valid = True
-            errors = []
-            if config_data:
-                if "custom_instructions" in config_data:
-                    if not isinstance(config_data["custom_instructions"], str):
-                        is_valid = False
-                        errors.append("custom_instructions must be a string")
-            return json.dumps({
-                "success": True,
-                "valid": is_valid,
-                "errors": errors
-            })
-            
-        else:
-            return json.dumps({"error": f"Unknown operation: {operation}"})
-            
-    except Exception as e:
-        logger.error(f"Error in mem0_config operation {operation}: {e}")
-        return json.dumps({"error": str(e)})
+    return await _dispatch("mem0_config", _CONFIG_OPERATIONS, dict(locals()))
 
 # ============================================================================
 # TOOL 6: mem0_webhook - Webhook management
 # ============================================================================
 
+# Note: Webhook functionality would require server-side implementation
+
+_WEBHOOK_SERVER_REQUIRED = _dump({
+    "success": True,
+    "message": "Webhook functionality requires server implementation"
+})
+_WEBHOOK_LIST = _dump({
+    "success": True,
+    "webhooks": [],
+    "message": "Webhook functionality requires server implementation"
+})
+_WEBHOOK_TEST_SENT = _dump({
+    "success": True,
+    "message": "Test event sent (requires server implementation)"
+})
+
+
+@_requires("url", error=_ERR_WEBHOOK_URL_REQUIRED)
+async def _webhook_create(url=None, **_) -> str:
+    return _dump({
+        "success": True,
+        "webhook_id": "webhook_123",
+        "message": "Webhook functionality requires server implementation"
+    })
+
+
+async def _webhook_list(**_) -> str:
+    return _WEBHOOK_LIST
+
+
+@_requires("webhook_id", error=_ERR_WEBHOOK_ID_REQUIRED)
+async def _webhook_update(webhook_id=None, **_) -> str:
+    return _WEBHOOK_SERVER_REQUIRED
+
+
+@_requires("webhook_id", error=_ERR_WEBHOOK_ID_REQUIRED)
+async def _webhook_delete(webhook_id=None, **_) -> str:
+    return _WEBHOOK_SERVER_REQUIRED
+
+
+@_requires("webhook_id", error=_ERR_WEBHOOK_ID_REQUIRED)
+async def _webhook_test(webhook_id=None, **_) -> str:
+    return _WEBHOOK_TEST_SENT
+
+
+_WEBHOOK_OPERATIONS: Dict[str, OperationHandler] = {
+    "create": _webhook_create,
+    "list": _webhook_list,
+    "update": _webhook_update,
+    "delete": _webhook_delete,
+    "test": _webhook_test,
+}
+
+
 @mcp.tool(
     description="""Manage webhooks for memory events.
     
@@ -468,59 +785,105 @@ async def mem0_webhook(
     headers: Optional[Dict[str, str]] = None
 ) -> str:
     """Execute webhook operations"""
-    try:
-        # Note: Webhook functionality would require server-side implementation
-        if operation == "create":
-            if not url:
-                return json.dumps({"error": "URL required for webhook"})
-            return json.dumps({
-                "success": True,
-                "webhook_id": "webhook_123",
-                "message": "Webhook functionality requires server implementation"
-            })
-            
-        elif operation == "list":
-            return json.dumps({
-                "success": True,
-                "webhooks": [],
-                "message": "Webhook functionality requires server implementation"
-            })
-            
-        elif operation == "update":
-            if not webhook_id:
-                return json.dumps({"error": "Webhook ID required"})
-            return json.dumps({
-                "success": True,
-                "message": "Webhook functionality requires server implementation"
-            })
-            
-        elif operation == "delete":
-            if not webhook_id:
-                return json.dumps({"error": "Webhook ID required"})
-            return json.dumps({
-                "success": True,
-                "message": "Webhook functionality requires server implementation"
-            })
-            
-        elif operation == "test":
-            if not webhook_id:
-                return json.dumps({"error": "Webhook ID required"})
-            return json.dumps({
-                "success": True,
-                "message": "Test event sent (requires server implementation)"
-            })
-            
-        else:
-            return json.dumps({"error": f"Unknown operation: {operation}"})
-            
-    except Exception as e:
-        logger.error(f"Error in mem0_webhook operation {operation}: {e}")
-        return json.dumps({"error": str(e)})
+    return await _dispatch("mem0_webhook", _WEBHOOK_OPERATIONS, dict(locals()))
 
 # ============================================================================
 # TOOL 7: mem0_advanced - Advanced features
 # ============================================================================
 
+async def _usage_stats(user_id: str) -> Dict[str, Any]:
+    """
+    Aggregate a user's memories page by page, reusing a recent result.
+
+    Only one page is held at a time, so memory use does not grow with the
+    user's history. A per-user lock keeps back-to-back advanced calls from
+    walking the same list twice without serializing other users behind it.
+    """
+    stats = _usage_cache.get(user_id)
+    if stats is not None:
+        return stats
+
+    # No await separates the lookup from the insert, so no guard lock is needed
+    lock = _usage_locks.get(user_id)
+    if lock is None:
+        lock = _usage_locks[user_id] = asyncio.Lock()
+
+    async with lock:
+        try:
+            stats = _usage_cache.get(user_id)
+            if stats is not None:
+                return stats
+
+            total = 0
+            categories: Counter = Counter()
+            metadata_keys: set = set()
+            async for memories in _iter_memory_pages(user_id):
+                total += len(memories)
+                # Count categories and collect metadata keys in C-level builtins rather than a per-memory loop.
+                # The counter and set hold one key per distinct value, so repeated names cost nothing extra.
+                categories.update(itertools.chain.from_iterable(
+                    memory.get("categories") or () for memory in memories
+                ))
+                metadata_keys.update(*(memory["metadata"] for memory in memories if memory.get("metadata")))
+
+            stats = {
+                "total_memories": total,
+                "categories": dict(categories),
+                "metadata_keys": list(metadata_keys)
+            }
+            _usage_cache.set(user_id, stats)
+            return stats
+        finally:
+            if _usage_locks.get(user_id) is lock:
+                del _usage_locks[user_id]
+
+
+async def _advanced_analyze_usage(user_id=None, **_) -> str:
+    stats = await _usage_stats(user_id)
+    analysis = {
+        "total_memories": stats["total_memories"],
+        "user_id": user_id,
+        "categories": stats["categories"],
+        "metadata_keys": stats["metadata_keys"]
+    }
+    return _dump({"success": True, "analysis": analysis})
+
+
+async def _advanced_optimize_storage(**_) -> str:
+    # This would involve deduplication, compression, etc.
+    return _dump({
+        "success": True,
+        "message": "Storage optimization requires backend implementation",
+        "recommendation": "Consider implementing deduplication for similar memories"
+    })
+
+
+# Everything in the insights payload except the memory count is fixed
+_STATIC_INSIGHTS = MappingProxyType({
+    "common_topics": [],
+    "memory_growth": "stable",
+    "recommendations": [
+        "Regular memory review helps maintain relevance",
+        "Consider categorizing memories for better organization",
+        "Use metadata to track memory sources"
+    ]
+})
+
+
+async def _advanced_generate_insights(user_id=None, **_) -> str:
+    # The count comes from the cached usage aggregate, so repeat calls do not refetch
+    stats = await _usage_stats(user_id)
+    insights = {"memory_count": stats["total_memories"], **_STATIC_INSIGHTS}
+    return _dump({"success": True, "insights": insights})
+
+
+_ADVANCED_OPERATIONS: Dict[str, OperationHandler] = {
+    "analyze_usage": _advanced_analyze_usage,
+    "optimize_storage": _advanced_optimize_storage,
+    "generate_insights": _advanced_generate_insights,
+}
+
+
 @mcp.tool(
     description="""Advanced memory features including analytics and optimization.
     
@@ -533,64 +896,9 @@ async def mem0_advanced(
     analysis_type: Optional[str] = None
 ) -> str:
     """Execute advanced operations"""
-    try:
-        user_id = user_id or DEFAULT_USER_ID
-        
-        if operation == "analyze_usage":
-            # Get all memories for analysis
-            memories = mem0_client.get_all(user_id=user_id, output_format="v1.1")
-            
-            analysis = {
-                "total_memories": len(memories),
-                "user_id": user_id,
-                "categories": {},
-                "metadata_keys": set()
-            }
-            
-            for memory in memories:
-                # Count categories
-                for cat in memory.get("categories", []):
-                    analysis["categories"][cat] = analysis["categories"].get(cat, 0) + 1
-                # Collect metadata keys
-                if memory.get("metadata"):
-                    analysis["metadata_keys"].update(memory["metadata"].keys())
-                    
-            analysis["metadata_keys"] = list(analysis["metadata_keys"])
-            return json.dumps({"success": True, "analysis": analysis})
-            
-        elif operation == "optimize_storage":
-            # This would involve deduplication, compression, etc.
-            return json.dumps({
-                "success": True,
-                "message": "Storage optimization requires backend implementation",
-                "recommendation": "Consider implementing deduplication for similar memories"
-            })
-            
-        elif operation == "generate_insights":
-            memories = mem0_client.get_all(user_id=user_id, output_format="v1.1")
-            
-            insights = {
-                "memory_count": len(memories),
-                "common_topics": [],
-                "memory_growth": "stable",
-                "recommendations": [
-                    "Regular memory review helps maintain relevance",
-                    "Consider categorizing memories for better organization",
-                    "Use metadata to track memory sources"
-                ]
-            }
-            
-            return json.dumps({"success": True, "insights": insights})
-            
-        else:
-            return json.dumps({"error": f"Unknown operation: {operation}"})
-            
-    except Exception as e:
-        logger.error(f"Error in mem0_advanced operation {operation}: {e}")
-        return json.dumps({"error": str(e)})
-
-# Import datetime for export operations
-from datetime import datetime
+    params = dict(locals())
+    params["user_id"] = user_id or DEFAULT_USER_ID
+    return await _dispatch("mem0_advanced", _ADVANCED_OPERATIONS, params)
 
 def main():
     """Main entry point for enhanced mode"""
@@ -608,7 +916,11 @@ def main():
     # Note: FastMCP with SSE transport ignores host/port arguments
     # The server will always run on 0.0.0.0:8000 by default
     print(f"Note: FastMCP SSE server will run on http://0.0.0.0:8000/sse (ignoring host/port args)")
-    mcp.run(transport="sse")
+    install_fast_event_loop()
+    try:
+        mcp.run(transport="sse")
+    finally:
+        close_client()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,9 +1,10 @@
 from mcp.server.fastmcp import FastMCP
 from mem0 import MemoryClient
 from dotenv import load_dotenv
-import json
 import argparse
 
+from mem0_mcp.encoding import dump_json
+
 load_dotenv()
 
 # Initialize mem0 client during module import
@@ -92,7 +93,7 @@ async def get_all_coding_preferences() -> str:
     try:
         memories = mem0_client.get_all(user_id=DEFAULT_USER_ID, page=1, page_size=50)
         flattened_memories = [memory["memory"] for memory in memories["results"]]
-        return json.dumps(flattened_memories, indent=2)
+        return dump_json(flattened_memories, pretty=True)
     except Exception as e:
         return f"Error getting preferences: {str(e)}"
 
@@ -125,7 +126,7 @@ async def search_coding_preferences(query: str) -> str:
     try:
         memories = mem0_client.search(query, user_id=DEFAULT_USER_ID, output_format="v1.1")
         flattened_memories = [memory["memory"] for memory in memories["results"]]
-        return json.dumps(flattened_memories, indent=2)
+        return dump_json(flattened_memories, pretty=True)
     except Exception as e:
         return f"Error searching preferences: {str(e)}"
 
@@ -0,0 +1,114 @@
+"""
+Shared mem0 Client
+
+Lazily constructs the MemoryClient used by the FastMCP entry points, so
+importing a server module does not block on network calls.
+"""
+
+import hashlib
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import httpx
+from mem0 import MemoryClient
+
+logger = logging.getLogger(__name__)
+
+CUSTOM_INSTRUCTIONS = """
+Extract the Following Information:  
+
+- Code Snippets: Save the actual code for future reference.  
+- Explanation: Document a clear description of what the code does and how it works.
+- Related Technical Details: Include information about the programming language, dependencies, and system specifications.  
+- Key Features: Highlight the main functionalities and important aspects of the snippet.
+"""
+
+# Records which instructions were last pushed, so restarts skip the redundant update_project call
+INSTRUCTIONS_MARKER = Path(
+    os.environ.get("MEM0_MCP_INSTRUCTIONS_MARKER", "~/.mem0_mcp_instr_hash")
+).expanduser()
+
+# Keep-alive connections held open to the mem0 API; should cover the batch/import concurrency
+HTTP_POOL_SIZE = int(os.environ.get("MEM0_HTTP_POOL_SIZE", "32"))
+
+# Seconds an idle connection stays open; tool calls often arrive further apart than httpx's 5s default
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("MEM0_HTTP_KEEPALIVE", "60"))
+
+
+def _widen_connection_pool(client: MemoryClient) -> None:
+    """
+    Rebuild the client's shared httpx session with a larger, longer-lived keep-alive pool.
+
+    httpx keeps only 20 idle connections for 5 seconds by default, so concurrent
+    batch calls, and calls spaced a few seconds apart, would keep paying fresh
+    TLS handshakes.
+    """
+    session = getattr(client, "client", None)
+    if not isinstance(session, httpx.Client):
+        logger.warning("mem0 client has no httpx session; keeping its default connection pool")
+        return
+
+    client.client = httpx.Client(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=session.timeout,
+        limits=httpx.Limits(
+            max_connections=HTTP_POOL_SIZE,
+            max_keepalive_connections=HTTP_POOL_SIZE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+    session.close()
+
+
+def _instructions_hash(instructions: str) -> str:
+    """Hash instructions together with the API key they were pushed with"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(os.environ.get("MEM0_API_KEY", "").encode())
+    digest.update(instructions.encode())
+    return digest.hexdigest()
+
+
+def record_instructions(instructions: str) -> None:
+    """Remember which custom instructions the project currently has"""
+    try:
+        INSTRUCTIONS_MARKER.write_text(_instructions_hash(instructions))
+    except OSError as e:
+        logger.warning(f"Could not write instructions marker {INSTRUCTIONS_MARKER}: {e}")
+
+
+def _instructions_current(instructions: str) -> bool:
+    try:
+        return INSTRUCTIONS_MARKER.read_text() == _instructions_hash(instructions)
+    except OSError:
+        return False
+
+
+@lru_cache(maxsize=1)
+def get_client() -> MemoryClient:
+    """
+    Get the shared mem0 client, creating it on first use.
+
+    All calls share one pooled HTTP session. Project instructions are only
+    pushed when they differ from the ones recorded by the previous run.
+    """
+    logger.info("Initializing mem0 client...")
+    client = MemoryClient()
+    _widen_connection_pool(client)
+    if not _instructions_current(CUSTOM_INSTRUCTIONS):
+        client.update_project(custom_instructions=CUSTOM_INSTRUCTIONS)
+        record_instructions(CUSTOM_INSTRUCTIONS)
+    logger.info("mem0 client initialized successfully")
+    return client
+
+
+def close_client() -> None:
+    """Close the shared client's HTTP session, if one was created"""
+    if get_client.cache_info().currsize == 0:
+        return
+    session = getattr(get_client(), "client", None)
+    if isinstance(session, httpx.Client):
+        session.close()
+    get_client.cache_clear()
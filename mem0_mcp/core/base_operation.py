@@ -6,12 +6,26 @@ dynamically loaded and executed by tools.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, TypedDict, Union, Callable, Awaitable, AsyncGenerator
+from typing import Any, Dict, List, Optional, Tuple, TypedDict, Union, Callable, Awaitable, AsyncGenerator
 from dataclasses import dataclass, field
 import inspect
 import asyncio
+import hashlib
+import json
 from enum import Enum
 
+from ..caching import TTLCache
+
+try:
+    import orjson
+except ImportError:  # optional speedups; cache keys fall back to stdlib json + md5
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 class ParameterType(Enum):
     """Supported parameter types for operations"""
     STRING = "string"
@@ -23,7 +37,22 @@ class ParameterType(Enum):
     ANY = "any"
 
 
-@dataclass
+# Python types accepted for each parameter type; built once rather than per validation
+_TYPE_CHECKS: Dict[ParameterType, Union[type, tuple]] = {
+    ParameterType.STRING: str,
+    ParameterType.INTEGER: int,
+    ParameterType.FLOAT: (int, float),
+    ParameterType.BOOLEAN: bool,
+    ParameterType.OBJECT: dict,
+    ParameterType.ARRAY: list,
+    ParameterType.ANY: object
+}
+
+# Value types whose repr() is a stable, unambiguous cache key component
+_KEY_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+
+@dataclass(slots=True)
 class ParameterDefinition:
     """Defines a parameter for an operation"""
     name: str
@@ -46,20 +75,62 @@ class ParameterDefinition:
             return self.validation(value)
             
         # Type validation
-        type_validators = {
-            ParameterType.STRING: lambda v: isinstance(v, str),
-            ParameterType.INTEGER: lambda v: isinstance(v, int),
-            ParameterType.FLOAT: lambda v: isinstance(v, (int, float)),
-            ParameterType.BOOLEAN: lambda v: isinstance(v, bool),
-            ParameterType.OBJECT: lambda v: isinstance(v, dict),
-            ParameterType.ARRAY: lambda v: isinstance(v, list),
-            ParameterType.ANY: lambda v: True
-        }
+        return isinstance(value, _TYPE_CHECKS[self.type])
+    
+    def compile(self) -> Callable[[Any], bool]:
+        """Build a check equivalent to validate() with this definition's settings bound in"""
+        if self.choices or self.validation:
+            return self.validate
         
-        return type_validators[self.type](value)
+        expected = _TYPE_CHECKS[self.type]
+        optional = not self.required
+        return lambda value: optional if value is None else isinstance(value, expected)
+
+
+def compile_validator(
+    parameters: List[ParameterDefinition]
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Build a validation function for a fixed parameter list.
+    
+    Names, defaults and checks are resolved once, so each call only runs the
+    bound checks instead of re-reading every ParameterDefinition.
+    """
+    if not parameters:
+        # Only declared parameters are passed through, so there is nothing to check
+        return lambda params: {}
+    
+    checks = tuple(
+        (param_def.name, param_def.default, param_def.required, param_def.compile())
+        for param_def in parameters
+    )
+    
+    def validate(params: Dict[str, Any]) -> Dict[str, Any]:
+        validated = {}
+        errors = None
+        
+        for name, default, required, check in checks:
+            value = params.get(name, default)
+            
+            if not check(value):
+                if errors is None:
+                    errors = []
+                errors.append(f"Invalid value for parameter '{name}'")
+                continue
+                
+            # Omitted optional parameters stay absent so handlers' own defaults apply
+            if required or value is not None:
+                validated[name] = value
+                
+        if errors:
+            raise ValueError(f"Parameter validation failed: {', '.join(errors)}")
+            
+        return validated
+    
+    return validate
 
 
-@dataclass
+@dataclass(slots=True)
 class OperationMetadata:
     """Metadata for an operation"""
     name: str
@@ -75,6 +146,9 @@ class OperationMetadata:
 class OperationContext:
     """Context passed to operation handlers"""
     
+    # Created for every call; no per-instance __dict__ is needed
+    __slots__ = ("tool_name", "operation_name", "user_id", "session_id", "metadata", "start_time")
+    
     def __init__(
         self,
         tool_name: str,
@@ -111,6 +185,10 @@ class BaseOperationHandler(ABC):
     def __init__(self):
         self._middleware: List[Callable] = []
         self._cache: Optional[Dict[str, Any]] = None
+        self._cached_metadata: Optional[OperationMetadata] = None
+        self._validate_fn: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+        # Whether the validate/pre/post hooks can be bypassed; resolved on first call
+        self._direct: Optional[bool] = None
         
     @property
     @abstractmethod
@@ -118,25 +196,23 @@ class BaseOperationHandler(ABC):
         """Return operation metadata"""
         pass
     
+    def get_metadata(self) -> OperationMetadata:
+        """Return operation metadata, building it only once per handler"""
+        metadata = getattr(self, "_cached_metadata", None)
+        if metadata is None:
+            metadata = self._cached_metadata = self.metadata
+        return metadata
+    
+    def _validator(self) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Return the compiled validator for this handler's parameters"""
+        validate = getattr(self, "_validate_fn", None)
+        if validate is None:
+            validate = self._validate_fn = compile_validator(self.get_metadata().parameters)
+        return validate
+    
     async def validate_parameters(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and normalize parameters"""
-        validated = {}
-        errors = []
-        
-        for param_def in self.metadata.parameters:
-            value = params.get(param_def.name, param_def.default)
-            
-            if not param_def.validate(value):
-                errors.append(f"Invalid value for parameter '{param_def.name}'")
-                continue
-                
-            if value is not None or param_def.required:
-                validated[param_def.name] = value
-                
-        if errors:
-            raise ValueError(f"Parameter validation failed: {', '.join(errors)}")
-            
-        return validated
+        return self._validator()(params)
     
     async def pre_execute(self, context: OperationContext, params: Dict[str, Any]) -> Dict[str, Any]:
         """Hook called before execution"""
@@ -160,9 +236,29 @@ class BaseOperationHandler(ABC):
             "tool": context.tool_name
         }
     
+    def _uses_default_hooks(self) -> bool:
+        """
+        Check whether validate/pre/post are the base pass-throughs.
+        
+        Such handlers can skip those coroutines entirely; the answer depends
+        only on the class, so it is resolved once per handler.
+        """
+        direct = getattr(self, "_direct", None)
+        if direct is None:
+            cls = type(self)
+            direct = self._direct = (
+                cls.validate_parameters is BaseOperationHandler.validate_parameters
+                and cls.pre_execute is BaseOperationHandler.pre_execute
+                and cls.post_execute is BaseOperationHandler.post_execute
+            )
+        return direct
+    
     async def __call__(self, context: OperationContext, **params) -> Dict[str, Any]:
         """Execute the operation with full lifecycle"""
         try:
+            if self._uses_default_hooks():
+                return await self.execute(context, **self._validator()(params))
+            
             # Validate parameters
             validated_params = await self.validate_parameters(params)
             
@@ -181,19 +277,93 @@ class BaseOperationHandler(ABC):
             return await self.handle_error(context, e)
 
 
+@dataclass(slots=True)
+class BatchChunkResult:
+    """Per-item results of one bulk backend call, plus that call's own response"""
+    items: List[Dict[str, Any]]
+    response: Any = None
+
+
 class BatchOperationHandler(BaseOperationHandler):
-    """Base class for operations that support batch processing"""
+    """
+    Base class for operations that support batch processing.
+    
+    Items are split into chunks of `batch_size` that run concurrently, at most
+    `batch_concurrency` at a time. Subclasses should override `_execute_chunk`
+    with a single bulk backend call; without one, or when `_use_chunks` says
+    the bulk call is unavailable, items run through `_execute_item`
+    individually under the same concurrency bound.
+    
+    A bulk call's response usually covers the whole chunk rather than each
+    item; `_execute_chunk` can return a `BatchChunkResult` so it is reported
+    once per chunk under "batches" instead of being repeated on every item.
+    `execute_batch` remains the hook for replacing batch execution outright.
+    """
+    
+    batch_size: int = 100
+    batch_concurrency: int = 16
+    # Parameter carrying the list of items to process as a batch
+    items_param: str = "items"
     
-    @abstractmethod
     async def execute_batch(self, context: OperationContext, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Execute operation on multiple items"""
-        pass
+        results, responses = await self._run_batch(context, items)
+        if responses:
+            # Per-chunk bulk responses travel on the per-call context; execute reports them
+            context.metadata.setdefault("batch_responses", []).extend(responses)
+        return results
+    
+    async def _run_batch(self, context: OperationContext, items: List[Any]) -> Tuple[List[Dict[str, Any]], List[Any]]:
+        """Execute all items, returning per-item results and any per-chunk bulk responses"""
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        
+        async def bounded(call: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await call
+                
+        # Without a bulk call there is nothing to group items for
+        if not self._use_chunks(context):
+            return list(await asyncio.gather(*(bounded(self._execute_item(context, item)) for item in items))), []
+            
+        size = self.batch_size
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        chunk_results = await asyncio.gather(*(bounded(self._execute_chunk(context, chunk)) for chunk in chunks))
+        
+        results: List[Dict[str, Any]] = []
+        responses: List[Any] = []
+        for chunk_result in chunk_results:
+            if isinstance(chunk_result, BatchChunkResult):
+                results.extend(chunk_result.items)
+                if chunk_result.response is not None:
+                    responses.append(chunk_result.response)
+            else:
+                results.extend(chunk_result)
+        return results, responses
+    
+    async def _execute_chunk(
+        self, context: OperationContext, chunk: List[Any]
+    ) -> Union[List[Dict[str, Any]], BatchChunkResult]:
+        """Execute one chunk of items; override with a bulk backend call where one exists"""
+        return list(await asyncio.gather(*(self._execute_item(context, item) for item in chunk)))
+    
+    def _use_chunks(self, context: OperationContext) -> bool:
+        """Whether items go to `_execute_chunk` in bulk; by default, whenever it is overridden"""
+        return type(self)._execute_chunk is not BatchOperationHandler._execute_chunk
+    
+    async def _execute_item(self, context: OperationContext, item: Any) -> Dict[str, Any]:
+        """Execute one item of a batch on its own"""
+        return await self.execute_single(context, **item)
     
     async def execute(self, context: OperationContext, **params) -> Dict[str, Any]:
         """Execute single or batch operation"""
-        if "items" in params and isinstance(params["items"], list):
-            results = await self.execute_batch(context, params["items"])
-            return {"results": results, "count": len(results)}
+        items = params.get(self.items_param)
+        if isinstance(items, list):
+            results = await self.execute_batch(context, items)
+            response = {"results": results, "count": len(results)}
+            responses = context.metadata.pop("batch_responses", None)
+            if responses:
+                response["batches"] = responses
+            return response
         else:
             # Single item execution
             return await self.execute_single(context, **params)
@@ -204,8 +374,20 @@ class BatchOperationHandler(BaseOperationHandler):
         pass
 
 
+async def collect_stream(stream: AsyncGenerator[Dict[str, Any], None]) -> List[Dict[str, Any]]:
+    """Drain a streaming result into a list, for callers that need every item at once"""
+    return [item async for item in stream]
+
+
 class StreamingOperationHandler(BaseOperationHandler):
-    """Base class for operations that support streaming responses"""
+    """
+    Base class for operations that support streaming responses.
+    
+    With `stream=True` the result carries the live generator, and the server
+    encodes items into the response as they are produced instead of collecting
+    them first. Errors raised mid-stream go through `handle_error`, whose
+    response becomes the stream's last item.
+    """
     
     @abstractmethod
     async def execute_stream(
@@ -222,52 +404,115 @@ class StreamingOperationHandler(BaseOperationHandler):
             # Return streaming response
             return {
                 "stream": True,
-                "generator": self.execute_stream(context, **params)
+                "generator": self._guarded_stream(context, params)
             }
         else:
             # Collect all results
-            results = []
+            return {"results": await collect_stream(self.execute_stream(context, **params))}
+            
+    async def _guarded_stream(
+        self,
+        context: OperationContext,
+        params: Dict[str, Any]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield the stream's items, ending with handle_error's response if it fails"""
+        try:
             async for item in self.execute_stream(context, **params):
-                results.append(item)
-            return {"results": results}
+                yield item
+        except Exception as e:
+            yield await self.handle_error(context, e)
 
 
 class CachedOperationHandler(BaseOperationHandler):
     """Base class for operations with built-in caching"""
     
-    def __init__(self, cache_ttl: int = 300):
+    def __init__(self, cache_ttl: int = 300, max_entries: int = 1024):
         super().__init__()
         self.cache_ttl = cache_ttl
-        self._cache = {}
-        
+        # LRU-bounded so a long-running server with many distinct params cannot grow without limit
+        self._cache = TTLCache(maxsize=max_entries, ttl=cache_ttl)
+        # In-flight computations by cache key, so concurrent misses compute once
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Declared parameter names in key order, resolved on first use
+        self._key_layout: Optional[tuple] = None
+        self._key_names: Optional[frozenset] = None
+
+    def _flat_cache_key(self, context: OperationContext, params: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Encode params positionally when they are exactly the declared scalar parameters.
+
+        Values are repr()-encoded so types stay distinct (1 vs "1") and embedded
+        NUL characters are escaped, keeping the separator unambiguous.
+        """
+        layout = self._key_layout
+        if layout is None:
+            layout = self._key_layout = tuple(
+                sorted(param.name for param in self.get_metadata().parameters)
+            )
+            self._key_names = frozenset(layout)
+
+        if params.keys() != self._key_names:
+            return None
+        values = [params[name] for name in layout]
+        for value in values:
+            if type(value) not in _KEY_SCALARS:
+                return None
+
+        return "\0".join((context.tool_name, context.operation_name, *map(repr, values))).encode()
+
     def get_cache_key(self, context: OperationContext, params: Dict[str, Any]) -> str:
         """Generate cache key for parameters"""
-        import hashlib
-        import json
-        
+        encoded = self._flat_cache_key(context, params)
+        if encoded is None:
+            encoded = self._structured_cache_key(context, params)
+
+        # The key is not security sensitive, so a fast non-cryptographic hash is enough
+        if xxhash is not None:
+            return xxhash.xxh3_64_hexdigest(encoded)
+        return hashlib.md5(encoded).hexdigest()
+
+    def _structured_cache_key(self, context: OperationContext, params: Dict[str, Any]) -> bytes:
+        """Serialize arbitrary params (nested or undeclared ones included) for hashing"""
         cache_data = {
             "tool": context.tool_name,
             "operation": context.operation_name,
             "params": params
         }
         
-        return hashlib.md5(
-            json.dumps(cache_data, sort_keys=True).encode()
-        ).hexdigest()
-    
+        # Keys are sorted so the same params always hash alike regardless of argument order
+        if orjson is not None:
+            return orjson.dumps(
+                cache_data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+            )
+        return json.dumps(cache_data, sort_keys=True, default=str).encode()
+
     async def execute(self, context: OperationContext, **params) -> Dict[str, Any]:
         """Execute with caching"""
         cache_key = self.get_cache_key(context, params)
         
         # Check cache
-        if cache_key in self._cache:
-            cached_time, cached_result = self._cache[cache_key]
-            if asyncio.get_event_loop().time() - cached_time < self.cache_ttl:
-                return {**cached_result, "_cached": True}
+        cached_result = self._cache.get(cache_key)
+        if cached_result is not None:
+            return {**cached_result, "_cached": True}
+        
+        # Only one caller per key executes; the rest wait and re-check the cache.
+        # No await separates the lookup from the insert, so no guard lock is needed.
+        lock = self._locks.get(cache_key)
+        if lock is None:
+            lock = self._locks[cache_key] = asyncio.Lock()
         
-        # Execute and cache
-        result = await super().execute(context, **params)
-        self._cache[cache_key] = (asyncio.get_event_loop().time(), result)
+        async with lock:
+            cached_result = self._cache.get(cache_key)
+            if cached_result is not None:
+                return {**cached_result, "_cached": True}
+            
+            # Execute and cache
+            try:
+                result = await super().execute(context, **params)
+                self._cache.set(cache_key, result)
+            finally:
+                if self._locks.get(cache_key) is lock:
+                    del self._locks[cache_key]
         
         return result
 
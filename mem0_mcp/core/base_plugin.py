@@ -6,7 +6,7 @@ dynamically into the Mem0 MCP Server.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Type, TypeVar, Generic
+from typing import Any, Dict, List, Optional, Type, TypeVar, Generic, Union
 from dataclasses import dataclass
 import asyncio
 import logging
@@ -153,11 +153,22 @@ class BackendPlugin(BasePlugin, Generic[T]):
         pass
 
 
+@dataclass
+class MiddlewareResponse:
+    """
+    Returned from `process_request` to answer a request without running it.
+    
+    The operation handler and any middleware later in the request chain are
+    skipped; only middleware that already saw the request sees the response.
+    """
+    response: Any
+
+
 class MiddlewarePlugin(BasePlugin):
     """Base class for plugins that act as middleware"""
     
     @abstractmethod
-    async def process_request(self, tool_name: str, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_request(self, tool_name: str, operation: str, params: Dict[str, Any]) -> Union[Dict[str, Any], MiddlewareResponse]:
         """Process incoming request before execution"""
         return params
     
@@ -185,7 +196,15 @@ class ExtensionPlugin(BasePlugin):
 
 
 class CompositePlugin(BasePlugin):
-    """Plugin that can contain multiple sub-plugins"""
+    """
+    Plugin that can contain multiple sub-plugins.
+    
+    Sub-plugins are set up in order and torn down in reverse. Subclasses whose
+    sub-plugins are independent can set `sequential = False` to set them up and
+    tear them down concurrently.
+    """
+    
+    sequential: bool = True
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         super().__init__(config)
@@ -197,13 +216,36 @@ class CompositePlugin(BasePlugin):
         
     async def setup(self) -> None:
         """Setup all sub-plugins"""
-        for plugin in self._plugins:
-            await plugin.initialize()
+        if self.sequential:
+            for plugin in self._plugins:
+                await plugin.initialize()
+        else:
+            # Let every setup finish, then undo the ones that succeeded if any failed
+            results = await asyncio.gather(
+                *(plugin.initialize() for plugin in self._plugins), return_exceptions=True
+            )
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                started = [
+                    plugin for plugin, result in zip(self._plugins, results)
+                    if not isinstance(result, BaseException)
+                ]
+                await asyncio.gather(*(plugin.teardown() for plugin in started), return_exceptions=True)
+                raise errors[0]
             
     async def teardown(self) -> None:
         """Teardown all sub-plugins"""
-        for plugin in reversed(self._plugins):
-            await plugin.teardown()
+        if self.sequential:
+            for plugin in reversed(self._plugins):
+                await plugin.teardown()
+        else:
+            # Every sub-plugin gets its teardown even if a sibling's fails
+            results = await asyncio.gather(
+                *(plugin.teardown() for plugin in reversed(self._plugins)), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
             
     def get_plugins(self, plugin_type: Type[T]) -> List[T]:
         """Get all sub-plugins of a specific type"""
@@ -9,23 +9,45 @@ Provides a flexible configuration system with support for:
 - Secret management
 """
 
+import bisect
 import os
+import re
 import json
 import yaml
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 from dataclasses import dataclass, field, asdict
 import logging
 from abc import ABC, abstractmethod
 import asyncio
 from datetime import datetime
 
+from ..encoding import dump_json, load_json
+
+try:
+    import watchfiles
+except ImportError:  # optional; config files are polled for changes instead
+    watchfiles = None
+
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader/dumper when PyYAML was built with it; same safe subset either way
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Characters a JSON document can start with (NaN/Infinity included for the stdlib parser)
+_JSON_START = frozenset('{["-0123456789tfnNI \t\r\n')
+
+# ${VAR} or ${config.key:default} placeholders in string values
+_TEMPLATE_RE = re.compile(r'\$\{([^}]+)\}')
+
 
 class ConfigSource(ABC):
     """Abstract base class for configuration sources"""
     
+    # Source priority (lower = higher priority); read once when the source is added
+    priority: int = 50
+    
     @abstractmethod
     async def load(self) -> Dict[str, Any]:
         """Load configuration from source"""
@@ -36,30 +58,38 @@ class ConfigSource(ABC):
         """Save configuration to source"""
         pass
         
-    @abstractmethod
     def get_priority(self) -> int:
         """Get source priority (lower = higher priority)"""
-        pass
+        return self.priority
 
 
 class EnvConfigSource(ConfigSource):
     """Load configuration from environment variables"""
     
+    priority = 10  # High priority
+    
     def __init__(self, prefix: str = "MEM0_"):
         self.prefix = prefix
         
     async def load(self) -> Dict[str, Any]:
         """Load configuration from environment"""
         config = {}
+        prefix = self.prefix
+        prefix_len = len(prefix)
         
         for key, value in os.environ.items():
-            if key.startswith(self.prefix):
+            if key.startswith(prefix):
                 # Convert MEM0_API_KEY to api.key
-                config_key = key[len(self.prefix):].lower().replace("_", ".")
+                config_key = key[prefix_len:].lower().replace("_", ".")
                 
+                # Plain strings, most values, cannot be JSON; skip the failing parse for them
+                if value[:1] not in _JSON_START:
+                    config[config_key] = value
+                    continue
+                    
                 # Try to parse JSON values
                 try:
-                    config[config_key] = json.loads(value)
+                    config[config_key] = load_json(value)
                 except json.JSONDecodeError:
                     config[config_key] = value
                     
@@ -69,9 +99,6 @@ class EnvConfigSource(ConfigSource):
         """Cannot save to environment"""
         raise NotImplementedError("Cannot save configuration to environment variables")
         
-    def get_priority(self) -> int:
-        return 10  # High priority
-        
     def _unflatten_dict(self, flat_dict: Dict[str, Any]) -> Dict[str, Any]:
         """Convert flat.key.notation to nested dict"""
         result = {}
@@ -81,9 +108,7 @@ class EnvConfigSource(ConfigSource):
             current = result
             
             for part in parts[:-1]:
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
+                current = current.setdefault(part, {})
                 
             current[parts[-1]] = value
             
@@ -93,11 +118,13 @@ class EnvConfigSource(ConfigSource):
 class FileConfigSource(ConfigSource):
     """Load configuration from file (JSON/YAML)"""
     
+    priority = 50  # Medium priority
+    
     def __init__(self, file_path: Union[str, Path], auto_reload: bool = False):
         self.file_path = Path(file_path)
+        # Watched for changes by the owning ConfigManager when set
         self.auto_reload = auto_reload
         self._last_modified: Optional[float] = None
-        self._watcher_task: Optional[asyncio.Task] = None
         
     async def load(self) -> Dict[str, Any]:
         """Load configuration from file"""
@@ -105,54 +132,42 @@ class FileConfigSource(ConfigSource):
             logger.warning(f"Configuration file not found: {self.file_path}")
             return {}
             
-        with open(self.file_path, "r") as f:
-            if self.file_path.suffix in [".yaml", ".yml"]:
-                config = yaml.safe_load(f) or {}
-            else:
-                config = json.load(f)
+        # Both parsers read raw bytes, so no intermediate decoded str copy is made
+        if self.file_path.suffix in [".yaml", ".yml"]:
+            with open(self.file_path, "rb") as f:
+                config = yaml.load(f, Loader=_YAML_LOADER) or {}
+        else:
+            config = load_json(self.file_path.read_bytes())
                 
         self._last_modified = self.file_path.stat().st_mtime
         
-        if self.auto_reload and not self._watcher_task:
-            self._watcher_task = asyncio.create_task(self._watch_file())
-            
         return config
         
     async def save(self, config: Dict[str, Any]) -> None:
         """Save configuration to file"""
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(self.file_path, "w") as f:
-            if self.file_path.suffix in [".yaml", ".yml"]:
-                yaml.safe_dump(config, f, default_flow_style=False)
-            else:
-                json.dump(config, f, indent=2)
+        if self.file_path.suffix in [".yaml", ".yml"]:
+            with open(self.file_path, "w") as f:
+                yaml.dump(config, f, Dumper=_YAML_DUMPER, default_flow_style=False)
+        else:
+            self.file_path.write_text(dump_json(config, pretty=True), encoding="utf-8")
                 
         self._last_modified = self.file_path.stat().st_mtime
         
-    def get_priority(self) -> int:
-        return 50  # Medium priority
-        
-    async def _watch_file(self) -> None:
-        """Watch file for changes"""
-        while self.auto_reload:
-            try:
-                await asyncio.sleep(1)
-                
-                if self.file_path.exists():
-                    mtime = self.file_path.stat().st_mtime
-                    if mtime != self._last_modified:
-                        logger.info(f"Configuration file changed: {self.file_path}")
-                        # Trigger reload via event
-                        # This would be handled by ConfigManager
-                        
-            except Exception as e:
-                logger.error(f"Error watching config file: {e}")
+    def has_changed(self) -> bool:
+        """Check whether the file was modified since it was last loaded or saved"""
+        try:
+            return self.file_path.stat().st_mtime != self._last_modified
+        except FileNotFoundError:
+            return False
 
 
 class RemoteConfigSource(ConfigSource):
     """Load configuration from remote source (e.g., API, etcd, consul)"""
     
+    priority = 30  # Higher than file, lower than env
+    
     def __init__(self, url: str, auth_token: Optional[str] = None):
         self.url = url
         self.auth_token = auth_token
@@ -167,9 +182,6 @@ class RemoteConfigSource(ConfigSource):
         """Save configuration to remote source"""
         # Implementation would use httpx or similar
         pass
-        
-    def get_priority(self) -> int:
-        return 30  # Higher than file, lower than env
 
 
 @dataclass
@@ -184,6 +196,61 @@ class ConfigSchema:
     children: Dict[str, 'ConfigSchema'] = field(default_factory=dict)
 
 
+SchemaCheck = Callable[[Dict[str, Any], str, List[str]], None]
+
+
+def compile_schema(schema: Dict[str, ConfigSchema]) -> SchemaCheck:
+    """
+    Build a checker for a configuration schema.
+    
+    The schema tree is walked once here; the returned function validates a
+    config section in place, filling in defaults and appending one message
+    per violation to the error list it is given.
+    """
+    checks = []
+    for key, entry in schema.items():
+        expected = (int, float) if entry.type is float else entry.type
+        children = compile_schema(entry.children) if entry.children else None
+        checks.append((key, entry, expected, children))
+        
+    def check(section: Dict[str, Any], prefix: str, errors: List[str]) -> None:
+        for key, entry, expected, children in checks:
+            path = f"{prefix}{key}"
+            value = section.get(key)
+            
+            if value is None:
+                if entry.default is not None:
+                    section[key] = entry.default
+                    continue
+                if children is None:
+                    if entry.required:
+                        errors.append(f"Missing required setting '{path}'")
+                    continue
+                # Absent sections are still checked so their defaults and required keys apply
+                value = section[key] = {}
+                
+            if not isinstance(value, expected):
+                errors.append(f"Setting '{path}' must be of type {entry.type.__name__}")
+            elif entry.validator and not entry.validator(value):
+                errors.append(f"Invalid value for setting '{path}'")
+            elif children is not None:
+                children(value, f"{path}.", errors)
+                
+    return check
+
+
+def _flatten(config: Dict[str, Any], prefix: str = ""):
+    """Yield (dotted path, value) for every section and setting in a nested config"""
+    for key, value in config.items():
+        # Keys containing dots cannot be addressed with dot notation
+        if not isinstance(key, str) or "." in key:
+            continue
+        path = f"{prefix}{key}"
+        yield path, value
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{path}.")
+
+
 class ConfigManager:
     """
     Central configuration management system.
@@ -198,21 +265,32 @@ class ConfigManager:
     
     def __init__(self):
         self._sources: List[ConfigSource] = []
+        # Priority of each entry in _sources, read once when the source is added
+        self._priorities: List[int] = []
         self._config: Dict[str, Any] = {}
         self._schema: Dict[str, ConfigSchema] = {}
-        self._listeners: List[callable] = []
+        self._schema_check: Optional[SchemaCheck] = None
+        # (listener, is coroutine function) pairs, classified once when added
+        self._listeners: List[Tuple[callable, bool]] = []
         self._secrets: Dict[str, str] = {}
         self._loaded = False
+        # Dotted-path index of _config for get(); rebuilt after each change
+        self._flat: Optional[Dict[str, Any]] = None
+        # One watcher for every auto-reloading file source
+        self._watch_task: Optional[asyncio.Task] = None
         
     def add_source(self, source: ConfigSource) -> None:
         """Add a configuration source"""
-        self._sources.append(source)
-        # Sort by priority
-        self._sources.sort(key=lambda s: s.get_priority())
+        # Keep sorted by priority; equal priorities stay in the order they were added
+        priority = source.get_priority()
+        index = bisect.bisect_right(self._priorities, priority)
+        self._priorities.insert(index, priority)
+        self._sources.insert(index, source)
         
     def define_schema(self, schema: Dict[str, ConfigSchema]) -> None:
         """Define configuration schema"""
         self._schema = schema
+        self._schema_check = compile_schema(schema)
         
     async def load(self) -> None:
         """Load configuration from all sources"""
@@ -221,12 +299,16 @@ class ConfigManager:
         # Start with empty config
         merged_config = {}
         
-        # Load from sources in reverse priority order
+        # Fetch all sources concurrently, then merge in reverse priority order
         # (so higher priority sources override)
-        for source in reversed(self._sources):
+        sources = self._sources[::-1]
+        results = await asyncio.gather(*(source.load() for source in sources), return_exceptions=True)
+        for source, config in zip(sources, results):
+            if isinstance(config, Exception):
+                logger.error(f"Failed to load config from {source.__class__.__name__}: {config}")
+                continue
             try:
-                config = await source.load()
-                merged_config = self._deep_merge(merged_config, config)
+                self._deep_merge_into(merged_config, config)
             except Exception as e:
                 logger.error(f"Failed to load config from {source.__class__.__name__}: {e}")
                 
@@ -240,33 +322,75 @@ class ConfigManager:
         # Decrypt secrets
         self._decrypt_secrets()
         
+        self._flat = None
         self._loaded = True
         
         # Notify listeners
         await self._notify_listeners()
         
+        self._start_watching()
+        
         logger.info("Configuration loaded successfully")
         
     async def reload(self) -> None:
         """Reload configuration from all sources"""
         await self.load()
         
+    def stop_watching(self) -> None:
+        """Stop watching configuration files for changes"""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+            
+    def _start_watching(self) -> None:
+        """Start the shared file watcher if any file source wants auto-reload"""
+        if self._watch_task is not None:
+            return
+        watched = {
+            source.file_path.resolve(): source
+            for source in self._sources
+            if isinstance(source, FileConfigSource) and source.auto_reload
+        }
+        if watched:
+            self._watch_task = asyncio.create_task(self._watch_files(watched))
+            
+    async def _watch_files(self, watched: Dict[Path, FileConfigSource]) -> None:
+        """
+        Reload once per batch of changes to any watched file.
+        
+        Uses filesystem notifications when watchfiles is installed, which
+        also debounces bursts of writes; otherwise polls every second.
+        """
+        if watchfiles is not None:
+            # Watch directories: editors that save via rename replace the file's inode
+            directories = {path.parent for path in watched}
+            async for changes in watchfiles.awatch(*directories):
+                if any(Path(path) in watched for _, path in changes):
+                    await self._reload_changed()
+        else:
+            while True:
+                await asyncio.sleep(1)
+                if any(source.has_changed() for source in watched.values()):
+                    await self._reload_changed()
+                    
+    async def _reload_changed(self) -> None:
+        """Reload after a watched file changed, keeping the watcher alive on errors"""
+        logger.info("Configuration file changed, reloading")
+        try:
+            await self.reload()
+        except Exception as e:
+            logger.error(f"Error reloading configuration: {e}")
+        
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get configuration value by key.
         
         Supports dot notation: config.get("api.key")
         """
-        parts = key.split(".")
-        value = self._config
-        
-        for part in parts:
-            if isinstance(value, dict) and part in value:
-                value = value[part]
-            else:
-                return default
-                
-        return value
+        flat = self._flat
+        if flat is None:
+            flat = self._flat = dict(_flatten(self._config))
+        return flat.get(key, default)
         
     def set(self, key: str, value: Any) -> None:
         """
@@ -279,11 +403,10 @@ class ConfigManager:
         config = self._config
         
         for part in parts[:-1]:
-            if part not in config:
-                config[part] = {}
-            config = config[part]
+            config = config.setdefault(part, {})
             
         config[parts[-1]] = value
+        self._flat = None
         
         # Notify listeners
         asyncio.create_task(self._notify_listeners())
@@ -302,48 +425,56 @@ class ConfigManager:
         
     def add_listener(self, listener: callable) -> None:
         """Add configuration change listener"""
-        self._listeners.append(listener)
+        self._listeners.append((listener, asyncio.iscoroutinefunction(listener)))
         
     def remove_listener(self, listener: callable) -> bool:
         """Remove configuration change listener"""
-        try:
-            self._listeners.remove(listener)
-            return True
-        except ValueError:
-            return False
+        for index, (registered, _) in enumerate(self._listeners):
+            if registered == listener:
+                del self._listeners[index]
+                return True
+        return False
             
     async def _notify_listeners(self) -> None:
-        """Notify all listeners of configuration change"""
-        for listener in self._listeners:
+        """Notify all listeners of configuration change, running async listeners concurrently"""
+        pending = []
+        # Iterate over a snapshot so listeners can add or remove listeners
+        for listener, is_async in tuple(self._listeners):
             try:
-                if asyncio.iscoroutinefunction(listener):
-                    await listener(self._config)
+                if is_async:
+                    pending.append(listener(self._config))
                 else:
                     listener(self._config)
             except Exception as e:
                 logger.error(f"Error in config listener: {e}")
                 
-    def _deep_merge(self, base: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
-        """Deep merge two dictionaries"""
-        result = base.copy()
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error in config listener: {result}")
+                
+    def _deep_merge_into(self, target: Dict[str, Any], update: Dict[str, Any]) -> None:
+        """
+        Deep merge a dictionary into target, in place.
         
+        Only load()'s accumulator is mutated; source results are freshly
+        loaded each time, so they can be adopted without copying.
+        """
         for key, value in update.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge(result[key], value)
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                self._deep_merge_into(current, value)
             else:
-                result[key] = value
-                
-        return result
+                target[key] = value
         
     def _apply_templates(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Apply template substitution to configuration values"""
-        import re
-        
         def substitute(value: Any) -> Any:
             if isinstance(value, str):
+                # Most values are plain strings with nothing to substitute
+                if "$" not in value:
+                    return value
+                    
                 # Replace ${VAR} with environment variable
-                pattern = re.compile(r'\$\{([^}]+)\}')
-                
                 def replacer(match):
                     var_name = match.group(1)
                     # Check environment
@@ -356,7 +487,7 @@ class ConfigManager:
                     else:
                         return str(self.get(var_name, match.group(0)))
                         
-                return pattern.sub(replacer, value)
+                return _TEMPLATE_RE.sub(replacer, value)
                 
             elif isinstance(value, dict):
                 return {k: substitute(v) for k, v in value.items()}
@@ -369,9 +500,11 @@ class ConfigManager:
         return substitute(config)
         
     def _validate_config(self) -> None:
-        """Validate configuration against schema"""
-        # TODO: Implement schema validation
-        pass
+        """Validate configuration against schema, filling in defaults"""
+        errors: List[str] = []
+        self._schema_check(self._config, "", errors)
+        if errors:
+            raise ValueError(f"Configuration validation failed: {', '.join(errors)}")
         
     def _decrypt_secrets(self) -> None:
         """Decrypt any encrypted configuration values"""
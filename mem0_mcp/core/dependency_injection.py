@@ -5,10 +5,12 @@ Provides a flexible dependency injection system for managing
 component lifecycles and dependencies.
 """
 
+import contextvars
+import functools
 import inspect
 import logging
-from typing import Any, Callable, Dict, List, Optional, Type, TypeVar, Union
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
+from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
 from abc import ABC, abstractmethod
@@ -17,6 +19,20 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Interfaces being resolved by the current resolution chain. Each task gets its own
+# copy of the context, so concurrent resolves never see each other's chains.
+_RESOLVING: contextvars.ContextVar[frozenset] = contextvars.ContextVar("resolving", default=frozenset())
+
+
+@functools.lru_cache(maxsize=None)
+def _ctor_params(cls: type) -> Tuple[Tuple[str, Any, bool], ...]:
+    """Constructor parameters of a class as (name, annotation, has_default), excluding self"""
+    return tuple(
+        (name, param.annotation, param.default is not param.empty)
+        for name, param in inspect.signature(cls.__init__).parameters.items()
+        if name != "self"
+    )
+
 
 class Scope(Enum):
     """Dependency scope definitions"""
@@ -25,6 +41,15 @@ class Scope(Enum):
     TRANSIENT = "transient"      # New instance every time
 
 
+class Construction(Enum):
+    """How a dependency's instances are produced"""
+    INSTANCE = "instance"            # Registered object is returned as-is
+    ASYNC_FACTORY = "async_factory"  # Awaited async factory
+    FACTORY = "factory"              # Factory function
+    CALLABLE = "callable"            # Implementation called directly
+    CLASS = "class"                  # Class constructed with resolved dependencies
+
+
 @dataclass
 class DependencyDefinition:
     """Definition of a dependency"""
@@ -36,12 +61,29 @@ class DependencyDefinition:
     async_factory: Optional[Callable] = None
     args: List[Any] = None
     kwargs: Dict[str, Any] = None
+    # Resolution plan, fixed at registration so resolve() does no introspection
+    construction: Construction = field(init=False)
+    ctor_params: Tuple[Tuple[str, Any, bool], ...] = field(init=False, default=())
     
     def __post_init__(self):
         if self.args is None:
             self.args = []
         if self.kwargs is None:
             self.kwargs = {}
+            
+        implementation = self.implementation
+        is_class = inspect.isclass(implementation)
+        if not is_class and not callable(implementation):
+            self.construction = Construction.INSTANCE
+        elif self.async_factory:
+            self.construction = Construction.ASYNC_FACTORY
+        elif self.factory:
+            self.construction = Construction.FACTORY
+        elif not is_class:
+            self.construction = Construction.CALLABLE
+        else:
+            self.construction = Construction.CLASS
+            self.ctor_params = _ctor_params(implementation)
 
 
 class Container:
@@ -60,8 +102,8 @@ class Container:
     def __init__(self):
         self._definitions: Dict[Type, List[DependencyDefinition]] = {}
         self._singletons: Dict[Type, Any] = {}
+        self._singleton_locks: Dict[Type, asyncio.Lock] = {}
         self._factories: Dict[Type, Callable] = {}
-        self._resolving: set = set()  # For circular dependency detection
         self._request_scope: Dict[Type, Any] = {}
         
     def register(
@@ -144,10 +186,11 @@ class Container:
             The resolved instance
         """
         # Check for circular dependencies
-        if interface in self._resolving:
+        chain = _RESOLVING.get()
+        if interface in chain:
             raise RuntimeError(f"Circular dependency detected for {interface}")
             
-        self._resolving.add(interface)
+        token = _RESOLVING.set(chain | {interface})
         
         try:
             # Find definition
@@ -173,15 +216,29 @@ class Container:
                 return await self._resolve_transient(definition)
                 
         finally:
-            self._resolving.remove(interface)
+            _RESOLVING.reset(token)
             
     async def _resolve_singleton(self, definition: DependencyDefinition) -> Any:
         """Resolve a singleton dependency"""
-        if definition.interface in self._singletons:
-            return self._singletons[definition.interface]
+        interface = definition.interface
+        if interface in self._singletons:
+            return self._singletons[interface]
             
-        instance = await self._create_instance(definition)
-        self._singletons[definition.interface] = instance
+        # Concurrent first resolves wait for one construction instead of each building an instance
+        lock = self._singleton_locks.get(interface)
+        if lock is None:
+            lock = self._singleton_locks[interface] = asyncio.Lock()
+            
+        async with lock:
+            if interface in self._singletons:
+                return self._singletons[interface]
+                
+            instance = await self._create_instance(definition)
+            self._singletons[interface] = instance
+            
+        # Once cached, the lookup above always hits, so the lock is no longer needed
+        if self._singleton_locks.get(interface) is lock:
+            del self._singleton_locks[interface]
         return instance
         
     async def _resolve_request(self, definition: DependencyDefinition) -> Any:
@@ -199,47 +256,45 @@ class Container:
         
     async def _create_instance(self, definition: DependencyDefinition) -> Any:
         """Create an instance of a dependency"""
+        construction = definition.construction
+        
         # If it's already an instance, return it
-        if not inspect.isclass(definition.implementation) and not callable(definition.implementation):
+        if construction is Construction.INSTANCE:
             return definition.implementation
             
         # Use async factory if provided
-        if definition.async_factory:
+        if construction is Construction.ASYNC_FACTORY:
             return await definition.async_factory(**definition.kwargs)
             
         # Use factory if provided
-        if definition.factory:
+        if construction is Construction.FACTORY:
             return definition.factory(**definition.kwargs)
             
         # If implementation is a callable (function/lambda)
-        if callable(definition.implementation) and not inspect.isclass(definition.implementation):
+        if construction is Construction.CALLABLE:
             return definition.implementation(**definition.kwargs)
             
         # Create instance from class
         cls = definition.implementation
         
         # Resolve constructor dependencies
-        sig = inspect.signature(cls.__init__)
         resolved_args = []
         resolved_kwargs = {}
         
-        for param_name, param in sig.parameters.items():
-            if param_name == "self":
-                continue
-                
+        for param_name, annotation, has_default in definition.ctor_params:
             # Check if we have a value in kwargs
             if param_name in definition.kwargs:
                 resolved_kwargs[param_name] = definition.kwargs[param_name]
                 continue
                 
             # Try to resolve by type annotation
-            if param.annotation != param.empty:
+            if annotation is not inspect.Parameter.empty:
                 try:
-                    resolved_value = await self.resolve(param.annotation)
+                    resolved_value = await self.resolve(annotation)
                     resolved_kwargs[param_name] = resolved_value
                 except ValueError:
                     # If required and no default, raise error
-                    if param.default == param.empty:
+                    if not has_default:
                         raise
                         
         # Create instance
@@ -255,17 +310,20 @@ class Container:
         """Clear request-scoped dependencies"""
         self._request_scope.clear()
         
-    def get_all(self, interface: Type[T]) -> List[T]:
-        """Get all registered implementations of an interface"""
+    async def get_all(self, interface: Type[T]) -> List[T]:
+        """Get all registered implementations of an interface, resolved concurrently"""
         definitions = self._definitions.get(interface, [])
+        results = await asyncio.gather(
+            *(self.resolve(interface, definition.name) for definition in definitions),
+            return_exceptions=True
+        )
         instances = []
         
-        for definition in definitions:
-            try:
-                instance = asyncio.run(self.resolve(interface, definition.name))
-                instances.append(instance)
-            except Exception as e:
-                logger.error(f"Failed to resolve {interface}: {e}")
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Failed to resolve {interface}: {result}")
+            else:
+                instances.append(result)
                 
         return instances
         
@@ -374,14 +432,20 @@ def injectable(scope: Scope = Scope.SINGLETON):
 def inject(container: Container):
     """Decorator to inject dependencies into a function"""
     def decorator(func):
+        # Only annotated parameters can be injected; the signature is read once
+        injectable_params = [
+            (param_name, param.annotation)
+            for param_name, param in inspect.signature(func).parameters.items()
+            if param.annotation != param.empty
+        ]
+        
         async def wrapper(*args, **kwargs):
-            sig = inspect.signature(func)
             injected_kwargs = {}
             
-            for param_name, param in sig.parameters.items():
-                if param.annotation != param.empty and param_name not in kwargs:
+            for param_name, annotation in injectable_params:
+                if param_name not in kwargs:
                     try:
-                        injected_kwargs[param_name] = await container.resolve(param.annotation)
+                        injected_kwargs[param_name] = await container.resolve(annotation)
                     except ValueError:
                         pass  # Skip if not registered
                         
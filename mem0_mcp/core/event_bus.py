@@ -6,11 +6,18 @@ between components and plugins.
 """
 
 import asyncio
+import bisect
+import inspect
 import logging
-from typing import Any, Callable, Dict, List, Optional, Set, Union
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Mapping, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime, UTC
 from enum import Enum
+from itertools import islice
+from operator import attrgetter
+import time
+from types import MappingProxyType
 import weakref
 
 logger = logging.getLogger(__name__)
@@ -25,31 +32,96 @@ class EventPriority(Enum):
     LOWEST = 100
 
 
-@dataclass
+class QueueOverflow(Enum):
+    """What emit_async does when the event queue is full"""
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+
+
+# Wall-clock/monotonic reference pair for turning monotonic readings into datetimes
+_WALL_ANCHOR = time.time()
+_MONOTONIC_ANCHOR_NS = time.monotonic_ns()
+
+
+def _to_monotonic_ns(moment: datetime) -> int:
+    """Map a wall-clock time onto the monotonic clock used for event creation times"""
+    return _MONOTONIC_ANCHOR_NS + int((moment.timestamp() - _WALL_ANCHOR) * 1e9)
+
+
+@dataclass(slots=True)
 class Event:
     """Base event class"""
     name: str
     data: Dict[str, Any] = field(default_factory=dict)
-    timestamp: datetime = field(default_factory=lambda: datetime.now(UTC))
     source: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Monotonic creation time; cheap to read and safe for ordering and replay delays
+    created_ns: int = field(default_factory=time.monotonic_ns)
+    _timestamp: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         self.metadata["event_id"] = id(self)
+        
+    @property
+    def timestamp(self) -> datetime:
+        """Wall-clock creation time, materialized on first access"""
+        if self._timestamp is None:
+            elapsed = (self.created_ns - _MONOTONIC_ANCHOR_NS) / 1e9
+            self._timestamp = datetime.fromtimestamp(_WALL_ANCHOR + elapsed, UTC)
+        return self._timestamp
+
+
+def _callback_key(callback: Callable) -> Any:
+    """Identity key for a callback; bound methods are keyed by owner and function"""
+    if inspect.ismethod(callback):
+        return (id(callback.__self__), id(callback.__func__))
+    return id(callback)
 
 
-@dataclass
+# EventHandler.flags bits
+_ONCE = 1
+_WEAK = 2
+_CORO = 4
+
+
+@dataclass(slots=True)
 class EventHandler:
-    """Wrapper for event handlers"""
+    """
+    Wrapper for event handlers.
+    
+    Weak handlers hold bound methods through weakref.WeakMethod, so they live as
+    long as their owner rather than the throwaway bound-method object.
+    """
     callback: Callable
     priority: EventPriority = EventPriority.NORMAL
     filter: Optional[Callable[[Event], bool]] = None
-    once: bool = False
-    weak: bool = False
+    # _ONCE/_WEAK from subscribe; _CORO is resolved from the original callback
+    # before any weak-reference wrapping
+    flags: int = 0
+    key: Any = field(init=False, default=None, repr=False)
     
     def __post_init__(self):
-        if self.weak:
-            self.callback = weakref.ref(self.callback)
+        if asyncio.iscoroutinefunction(self.callback):
+            self.flags |= _CORO
+        self.key = _callback_key(self.callback)
+        if self.flags & _WEAK:
+            if inspect.ismethod(self.callback):
+                self.callback = weakref.WeakMethod(self.callback)
+            else:
+                self.callback = weakref.ref(self.callback)
+                
+    @property
+    def once(self) -> bool:
+        return bool(self.flags & _ONCE)
+        
+    @property
+    def weak(self) -> bool:
+        return bool(self.flags & _WEAK)
+        
+    @property
+    def is_coro(self) -> bool:
+        return bool(self.flags & _CORO)
             
     def matches(self, event: Event) -> bool:
         """Check if handler should process this event"""
@@ -59,16 +131,38 @@ class EventHandler:
         
     async def invoke(self, event: Event) -> Any:
         """Invoke the handler"""
-        callback = self.callback() if self.weak else self.callback
+        callback = self.callback() if self.flags & _WEAK else self.callback
         if callback is None:
             return None
             
-        if asyncio.iscoroutinefunction(callback):
+        if self.flags & _CORO:
             return await callback(event)
         else:
             return callback(event)
 
 
+def _since_index(history: Deque[Event], since: datetime) -> int:
+    """Index of the first event in time-ordered history created after since"""
+    index = bisect.bisect_right(history, _to_monotonic_ns(since) + 1000, key=attrgetter("created_ns"))
+    # datetimes only carry microseconds, so settle the boundary on the datetime itself
+    while index and history[index - 1].timestamp > since:
+        index -= 1
+    return index
+
+
+# Shared read-only defaults for lookups that miss, so a miss allocates nothing
+_EMPTY_HANDLERS: Tuple[EventHandler, ...] = ()
+_EMPTY_INDEX: Mapping[Any, List[EventHandler]] = MappingProxyType({})
+
+
+def _priority_value(handler: EventHandler) -> int:
+    return handler.priority.value
+
+
+async def _no_handlers(event: Event) -> List[Any]:
+    return []
+
+
 class EventBus:
     """
     Central event bus for the system.
@@ -79,15 +173,33 @@ class EventBus:
     - Event filtering
     - Weak references for handlers
     - Event history
+    - Bounded async queue with an overflow policy
     - Event replay
     """
     
-    def __init__(self, history_size: int = 1000):
-        self._handlers: Dict[str, List[EventHandler]] = {}
-        self._history: List[Event] = []
+    def __init__(
+        self,
+        history_size: int = 1000,
+        queue_size: int = 10000,
+        overflow: QueueOverflow = QueueOverflow.BLOCK
+    ):
+        # Immutable, priority-ordered handler tuples; writers publish a new tuple
+        self._handlers: Dict[str, Tuple[EventHandler, ...]] = {}
+        # Per-event dispatch functions built from _handlers; dropped whenever a list changes
+        self._compiled: Dict[str, Callable[[Event], Awaitable[List[Any]]]] = {}
+        # Per-event reverse index from callback key to its handlers, for unsubscribe
+        self._handler_index: Dict[str, Dict[Any, List[EventHandler]]] = {}
+        # Bounded ring buffer; the oldest event is evicted in O(1) once full
+        self._history: Deque[Event] = deque(maxlen=history_size)
         self._history_size = history_size
+        # The same events indexed by name; trimmed in step with _history
+        self._history_by_name: Dict[str, Deque[Event]] = {}
         self._middleware: List[Callable] = []
-        self._event_queue: asyncio.Queue = asyncio.Queue()
+        # Middleware composed into one coroutine; None while there is no middleware
+        self._middleware_chain: Optional[Callable[[Event], Awaitable[Optional[Event]]]] = None
+        # Bounded so a slow worker can't let emit_async grow memory without limit
+        self._event_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._overflow = overflow
         self._running = False
         self._worker_task: Optional[asyncio.Task] = None
         
@@ -114,25 +226,19 @@ class EventBus:
         Returns:
             The handler function (for use with unsubscribe)
         """
-        if event_name not in self._handlers:
-            self._handlers[event_name] = []
-            
         event_handler = EventHandler(
             callback=handler,
             priority=priority,
             filter=filter,
-            once=once,
-            weak=weak
+            flags=(_ONCE if once else 0) | (_WEAK if weak else 0)
         )
         
-        # Insert handler in priority order
-        handlers = self._handlers[event_name]
-        insert_idx = len(handlers)
-        for i, h in enumerate(handlers):
-            if h.priority.value > priority.value:
-                insert_idx = i
-                break
-        handlers.insert(insert_idx, event_handler)
+        # Insert handler in priority order, after existing handlers of the same priority
+        handlers = self._handlers.get(event_name, _EMPTY_HANDLERS)
+        index = bisect.bisect_right(handlers, priority.value, key=_priority_value)
+        self._handlers[event_name] = handlers[:index] + (event_handler,) + handlers[index:]
+        self._handler_index.setdefault(event_name, {}).setdefault(event_handler.key, []).append(event_handler)
+        self._compiled.pop(event_name, None)
         
         logger.debug(f"Subscribed handler to event '{event_name}' with priority {priority.name}")
         return handler
@@ -144,18 +250,47 @@ class EventBus:
         Returns:
             True if handler was found and removed, False otherwise
         """
-        if event_name not in self._handlers:
+        candidates = self._handler_index.get(event_name, _EMPTY_INDEX).get(_callback_key(handler))
+        if not candidates:
             return False
             
-        handlers = self._handlers[event_name]
-        for i, h in enumerate(handlers):
-            callback = h.callback() if h.weak else h.callback
-            if callback == handler:
-                handlers.pop(i)
-                logger.debug(f"Unsubscribed handler from event '{event_name}'")
-                return True
-                
-        return False
+        # Keys are ids, so confirm the callback is still the same object
+        matching = [
+            h for h in candidates
+            if (h.callback() if h.weak else h.callback) == handler
+        ]
+        if not matching:
+            return False
+            
+        # Remove the first handler in dispatch order, as a scan would have found
+        self._remove_handlers(event_name, [min(matching, key=_priority_value)])
+        logger.debug(f"Unsubscribed handler from event '{event_name}'")
+        return True
+        
+    def _remove_handlers(self, event_name: str, handlers: List[EventHandler]) -> None:
+        """Drop handlers from an event with a single rebuild of its tuple"""
+        removed = {id(handler) for handler in handlers}
+        remaining = tuple(
+            handler for handler in self._handlers.get(event_name, _EMPTY_HANDLERS)
+            if id(handler) not in removed
+        )
+        self._compiled.pop(event_name, None)
+        
+        # Forget events left without handlers, e.g. ones that only had once handlers
+        if not remaining:
+            self._handlers.pop(event_name, None)
+            self._handler_index.pop(event_name, None)
+            return
+            
+        self._handlers[event_name] = remaining
+        index = self._handler_index.get(event_name, _EMPTY_INDEX)
+        for handler in handlers:
+            entries = index.get(handler.key)
+            if entries is None:
+                continue
+            entries[:] = [entry for entry in entries if entry is not handler]
+            if not entries:
+                del index[handler.key]
         
     def unsubscribe_all(self, event_name: Optional[str] = None) -> int:
         """
@@ -170,10 +305,14 @@ class EventBus:
             if event_name in self._handlers:
                 count = len(self._handlers[event_name])
                 del self._handlers[event_name]
+                self._handler_index.pop(event_name, None)
+                self._compiled.pop(event_name, None)
         else:
             for handlers in self._handlers.values():
                 count += len(handlers)
             self._handlers.clear()
+            self._handler_index.clear()
+            self._compiled.clear()
             
         return count
         
@@ -190,6 +329,11 @@ class EventBus:
         Returns:
             List of results from all handlers
         """
+        # With no handlers or middleware, the event only matters to history
+        listening = event_name in self._handlers or self._middleware_chain is not None
+        if not listening and not self._history_size:
+            return []
+            
         event = Event(
             name=event_name,
             data=data or {},
@@ -197,47 +341,115 @@ class EventBus:
             metadata=metadata or {}
         )
         
+        if not listening:
+            self._add_to_history(event)
+            return []
+            
+        return await self._dispatch(event)
+        
+    async def _dispatch(self, event: Event) -> List[Any]:
+        """Record, run middleware on, and deliver an already constructed event"""
+        event_name = event.name
+        
         # Add to history
         self._add_to_history(event)
         
         # Apply middleware
-        for middleware in self._middleware:
-            event = await middleware(event)
+        if self._middleware_chain is not None:
+            event = await self._middleware_chain(event)
             if event is None:
                 return []  # Event was cancelled
                 
-        # Get handlers
-        handlers = self._handlers.get(event_name, [])
-        results = []
-        handlers_to_remove = []
+        # Dispatch to handlers
+        return await self._get_dispatch(event_name)(event)
         
-        # Execute handlers
-        for handler in handlers:
-            # Check if weak reference is still valid
-            if handler.weak and handler.callback() is None:
-                handlers_to_remove.append(handler)
-                continue
-                
-            # Check filter
-            if not handler.matches(event):
-                continue
-                
-            try:
-                result = await handler.invoke(event)
-                results.append(result)
-                
-                # Remove one-time handlers
-                if handler.once:
-                    handlers_to_remove.append(handler)
+    def _get_dispatch(self, event_name: str) -> Callable[[Event], Awaitable[List[Any]]]:
+        """Get the compiled dispatch function for an event, building it if needed"""
+        dispatch = self._compiled.get(event_name)
+        if dispatch is None:
+            dispatch = self._compile_dispatch(event_name)
+        return dispatch
+        
+    def _compile_dispatch(self, event_name: str) -> Callable[[Event], Awaitable[List[Any]]]:
+        """
+        Build the dispatch function for an event's current handlers.
+        
+        Callbacks, filters and sync/async flags are resolved here once, so
+        emitting only runs the handlers. Rebuilt after any subscription change.
+        """
+        handlers = self._handlers.get(event_name)
+        if not handlers:
+            return _no_handlers
+            
+        entries = tuple(
+            (
+                handler, handler.callback, handler.flags & _CORO,
+                handler.flags & _WEAK, handler.filter, handler.flags & _ONCE
+            )
+            for handler in handlers
+        )
+        
+        async def dispatch(event: Event) -> List[Any]:
+            results = []
+            handlers_to_remove = []
+            # Async handlers run concurrently; each keeps its result slot so order is preserved
+            pending = []
+            coroutines = []
+            
+            # Execute handlers
+            for handler, callback, is_coro, weak, predicate, once in entries:
+                # Check if weak reference is still valid
+                if weak:
+                    callback = callback()
+                    if callback is None:
+                        handlers_to_remove.append(handler)
+                        continue
+                        
+                # Check filter
+                if predicate and not predicate(event):
+                    continue
                     
-            except Exception as e:
-                logger.error(f"Error in event handler for '{event_name}': {e}")
+                try:
+                    if is_coro:
+                        coroutines.append(callback(event))
+                        pending.append((len(results), handler, once))
+                        results.append(None)
+                        continue
+                        
+                    results.append(callback(event))
+                    
+                    # Remove one-time handlers
+                    if once:
+                        handlers_to_remove.append(handler)
+                        
+                except Exception as e:
+                    logger.error(f"Error in event handler for '{event_name}': {e}")
+                    
+            if coroutines:
+                failed = set()
+                outcomes = await asyncio.gather(*coroutines, return_exceptions=True)
+                for (slot, handler, once), outcome in zip(pending, outcomes):
+                    if isinstance(outcome, Exception):
+                        logger.error(f"Error in event handler for '{event_name}': {outcome}")
+                        failed.add(slot)
+                    elif isinstance(outcome, BaseException):
+                        raise outcome
+                    else:
+                        results[slot] = outcome
+                        if once:
+                            handlers_to_remove.append(handler)
+                            
+                if failed:
+                    results = [result for slot, result in enumerate(results) if slot not in failed]
+                    
+            # Remove dead/one-time handlers with a single rebuild of the current tuple
+            if handlers_to_remove:
+                self._remove_handlers(event_name, handlers_to_remove)
                 
-        # Remove dead/one-time handlers
-        for handler in handlers_to_remove:
-            self._handlers[event_name].remove(handler)
+            return results
             
-        return results
+        self._compiled[event_name] = dispatch
+        return dispatch
         
     async def emit_async(
         self,
@@ -248,6 +460,9 @@ class EventBus:
     ) -> None:
         """
         Emit an event asynchronously (queued for processing).
+        
+        When the queue is full, the bus's overflow policy decides whether this
+        waits for space, evicts the oldest queued event, or drops this one.
         """
         event = Event(
             name=event_name,
@@ -256,7 +471,25 @@ class EventBus:
             metadata=metadata or {}
         )
         
-        await self._event_queue.put(event)
+        if self._overflow is QueueOverflow.BLOCK:
+            await self._event_queue.put(event)
+            return
+            
+        try:
+            self._event_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            if self._overflow is QueueOverflow.DROP_NEWEST:
+                logger.warning(f"Event queue full, dropping event '{event_name}'")
+                return
+                
+            dropped = self._event_queue.get_nowait()
+            if dropped is None:
+                # Never evict the worker's stop signal; requeue it and drop this event instead
+                self._event_queue.put_nowait(None)
+                logger.warning(f"Event queue full while stopping, dropping event '{event_name}'")
+                return
+            logger.warning(f"Event queue full, dropping oldest event '{dropped.name}'")
+            self._event_queue.put_nowait(event)
         
     def add_middleware(self, middleware: Callable[[Event], Event]) -> None:
         """
@@ -265,20 +498,51 @@ class EventBus:
         Middleware can modify or cancel events.
         """
         self._middleware.append(middleware)
+        self._compile_middleware()
         
     def remove_middleware(self, middleware: Callable[[Event], Event]) -> bool:
         """Remove middleware"""
         try:
             self._middleware.remove(middleware)
-            return True
         except ValueError:
             return False
+        self._compile_middleware()
+        return True
+        
+    def _compile_middleware(self) -> None:
+        """Compose the current middleware into a single chain coroutine"""
+        if not self._middleware:
+            self._middleware_chain = None
+            return
+            
+        middlewares = tuple(self._middleware)
+        
+        async def chain(event: Event) -> Optional[Event]:
+            for middleware in middlewares:
+                event = await middleware(event)
+                if event is None:
+                    return None  # Event was cancelled
+            return event
+            
+        self._middleware_chain = chain
             
     def _add_to_history(self, event: Event) -> None:
         """Add event to history"""
-        self._history.append(event)
-        if len(self._history) > self._history_size:
-            self._history.pop(0)
+        if not self._history_size:
+            return
+            
+        history = self._history
+        if len(history) == self._history_size:
+            # The global buffer is about to evict its oldest event, which is
+            # also the oldest in that event's per-name deque
+            evicted = history[0]
+            same_name = self._history_by_name[evicted.name]
+            same_name.popleft()
+            if not same_name:
+                del self._history_by_name[evicted.name]
+                
+        history.append(event)
+        self._history_by_name.setdefault(event.name, deque()).append(event)
             
     def get_history(
         self,
@@ -294,18 +558,16 @@ class EventBus:
             limit: Maximum number of events to return
             since: Only return events after this time
         """
-        events = self._history
-        
-        if event_name:
-            events = [e for e in events if e.name == event_name]
-            
-        if since:
-            events = [e for e in events if e.timestamp > since]
+        history = self._history_by_name.get(event_name) if event_name else self._history
+        if not history:
+            return []
             
+        # History is in creation order, so the since cutoff and limit are both index bounds
+        start = _since_index(history, since) if since else 0
         if limit:
-            events = events[-limit:]
+            start = max(start, len(history) - limit)
             
-        return events
+        return list(islice(history, start, None))
         
     async def replay_events(
         self,
@@ -322,11 +584,11 @@ class EventBus:
         if not events:
             return
             
-        start_time = events[0].timestamp
+        start_time = events[0].created_ns
         
         for event in events:
             # Calculate delay
-            delay = (event.timestamp - start_time).total_seconds() / speed
+            delay = (event.created_ns - start_time) / 1e9 / speed
             if delay > 0:
                 await asyncio.sleep(delay)
                 
@@ -338,8 +600,13 @@ class EventBus:
                 {**event.metadata, "replayed": True}
             )
             
-            start_time = event.timestamp
+            start_time = event.created_ns
             
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker is processing events queued by emit_async"""
+        return self._running
+        
     async def start(self) -> None:
         """Start the event bus worker"""
         if self._running:
@@ -353,28 +620,53 @@ class EventBus:
         self._running = False
         
         if self._worker_task:
-            # Send stop signal
-            await self._event_queue.put(None)
+            # Send stop signal; the worker keeps reading until it sees it, so a
+            # full queue only waits for the next batch to be taken off it
+            try:
+                self._event_queue.put_nowait(None)
+            except asyncio.QueueFull:
+                await self._event_queue.put(None)
             await self._worker_task
             self._worker_task = None
             
     async def _worker(self) -> None:
-        """Background worker to process queued events"""
-        while self._running:
+        """Background worker to process queued events until the stop signal"""
+        while True:
             try:
                 event = await self._event_queue.get()
                 
                 if event is None:  # Stop signal
                     break
                     
-                # Process event
-                await self.emit(
-                    event.name,
-                    event.data,
-                    event.source,
-                    event.metadata
-                )
+                # Drain whatever else is already queued and process it in one pass
+                batch = [event]
+                stopping = False
+                while True:
+                    try:
+                        event = self._event_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if event is None:
+                        stopping = True
+                        break
+                    batch.append(event)
+                    
+                await self._emit_event_batch(batch)
                 
+                if stopping:
+                    break
+                    
+            except Exception as e:
+                logger.error(f"Error processing queued event: {e}")
+                
+    async def _emit_event_batch(self, events: List[Event]) -> None:
+        """Process a batch of queued events in order, reusing their Event objects"""
+        for event in events:
+            # Stamp at processing time, as re-emitting did, so history stays in time order
+            event.created_ns = time.monotonic_ns()
+            event._timestamp = None
+            try:
+                await self._dispatch(event)
             except Exception as e:
                 logger.error(f"Error processing queued event: {e}")
                 
@@ -10,9 +10,12 @@ import importlib.util
 import inspect
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Type, TypeVar, Union
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, TypeVar, Union
 import asyncio
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from .base_plugin import (
     BasePlugin, OperationPlugin, ToolPlugin, BackendPlugin,
@@ -24,6 +27,42 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BasePlugin)
 
+# Plugin base classes the registry buckets plugins by
+_PLUGIN_BASES = (OperationPlugin, ToolPlugin, BackendPlugin, MiddlewarePlugin, ExtensionPlugin)
+
+
+@lru_cache(maxsize=None)
+def _plugin_bases(plugin_class: Type[BasePlugin]) -> Tuple[Type[BasePlugin], ...]:
+    """Plugin base classes a plugin class belongs to, resolved once per class"""
+    return tuple(base for base in _PLUGIN_BASES if issubclass(plugin_class, base))
+
+
+@lru_cache(maxsize=None)
+def _is_concrete_plugin(cls: type) -> bool:
+    """Whether a class is a loadable plugin, resolved once per class"""
+    return issubclass(cls, BasePlugin) and cls is not BasePlugin and not inspect.isabstract(cls)
+
+
+def _plugin_classes(module: ModuleType) -> Iterator[Type[BasePlugin]]:
+    """Yield the concrete plugin classes defined in or imported into a module"""
+    for obj in vars(module).values():
+        if isinstance(obj, type) and _is_concrete_plugin(obj):
+            yield obj
+
+
+def _exec_plugin_file(file_path: Path) -> Optional[ModuleType]:
+    """Load a plugin module from a file"""
+    spec = importlib.util.spec_from_file_location(
+        f"plugin_{file_path.stem}",
+        file_path
+    )
+    if not spec or not spec.loader:
+        return None
+        
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
 
 class PluginRegistry:
     """
@@ -39,7 +78,12 @@ class PluginRegistry:
     
     def __init__(self):
         self._plugins: Dict[str, BasePlugin] = {}
-        self._plugin_types: Dict[Type[BasePlugin], List[str]] = defaultdict(list)
+        # Loaded plugins bucketed by base class, in load order
+        self._by_type: Dict[Type[BasePlugin], Dict[str, BasePlugin]] = defaultdict(dict)
+        # Sorted (request, response) middleware tuples; rebuilt after plugins change
+        self._middleware_chains: Optional[Tuple[Tuple[MiddlewarePlugin, ...], Tuple[MiddlewarePlugin, ...]]] = None
+        # Operation handlers per tool name; rebuilt after plugins change
+        self._operation_handlers: Dict[str, Dict[str, BaseOperationHandler]] = {}
         self._load_order: List[str] = []
         self._initialized = False
         
@@ -51,6 +95,7 @@ class PluginRegistry:
     def add_builtin_plugin(self, plugin_class: Type[BasePlugin]) -> None:
         """Register a built-in plugin class"""
         self._builtin_plugins.append(plugin_class)
+        self._invalidate_caches()
         
     def add_plugin_path(self, path: Union[str, Path]) -> None:
         """Add a directory to search for plugins"""
@@ -101,9 +146,9 @@ class PluginRegistry:
             self._plugins[metadata.name] = plugin
             
             # Register by type
-            for base_class in inspect.getmro(plugin_class):
-                if base_class in [OperationPlugin, ToolPlugin, BackendPlugin, MiddlewarePlugin, ExtensionPlugin]:
-                    self._plugin_types[base_class].append(metadata.name)
+            for base_class in _plugin_bases(plugin_class):
+                self._by_type[base_class][metadata.name] = plugin
+            self._invalidate_caches()
                     
             logger.info(f"Loaded plugin: {metadata.name} v{metadata.version}")
             
@@ -116,39 +161,36 @@ class PluginRegistry:
             logger.warning(f"Plugin path does not exist: {path}")
             return
             
-        for file_path in path.glob("*.py"):
-            if file_path.name.startswith("_"):
-                continue
-                
-            # Load module from file
-            spec = importlib.util.spec_from_file_location(
-                f"plugin_{file_path.stem}",
-                file_path
+        file_paths = [p for p in path.glob("*.py") if not p.name.startswith("_")]
+        if not file_paths:
+            return
+            
+        # Import the plugin files concurrently in worker threads, off the event loop
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=min(32, len(file_paths))) as executor:
+            modules = await asyncio.gather(
+                *(loop.run_in_executor(executor, _exec_plugin_file, p) for p in file_paths),
+                return_exceptions=True
             )
             
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+        for file_path, module in zip(file_paths, modules):
+            if isinstance(module, Exception):
+                logger.error(f"Failed to import plugin file {file_path}: {module}")
+                continue
+            if module is None:
+                continue
                 
-                # Find plugin classes in module
-                for name, obj in inspect.getmembers(module):
-                    if (inspect.isclass(obj) and 
-                        issubclass(obj, BasePlugin) and 
-                        obj != BasePlugin and
-                        not inspect.isabstract(obj)):
-                        await self._load_plugin_class(obj)
-                        
+            # Find plugin classes in module
+            for plugin_class in _plugin_classes(module):
+                await self._load_plugin_class(plugin_class)
+                    
     async def _discover_plugins_in_module(self, module_name: str) -> None:
         """Discover plugins in a Python module"""
         try:
             module = importlib.import_module(module_name)
             
-            for name, obj in inspect.getmembers(module):
-                if (inspect.isclass(obj) and 
-                    issubclass(obj, BasePlugin) and 
-                    obj != BasePlugin and
-                    not inspect.isabstract(obj)):
-                    await self._load_plugin_class(obj)
+            for plugin_class in _plugin_classes(module):
+                await self._load_plugin_class(plugin_class)
                     
         except ImportError as e:
             logger.error(f"Failed to import plugin module {module_name}: {e}")
@@ -164,25 +206,35 @@ class PluginRegistry:
         self._load_order = self._topological_sort(graph)
         
     def _topological_sort(self, graph: Dict[str, List[str]]) -> List[str]:
-        """Perform topological sort on dependency graph"""
-        visited = set()
-        stack = []
+        """Perform topological sort on dependency graph (Kahn's algorithm)"""
+        # Count unmet dependencies per plugin and index dependents by dependency
+        indegree: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for node, deps in graph.items():
+            indegree[node] = 0
+            for dep in deps:
+                if dep in graph:  # Only count dependencies that exist
+                    indegree[node] += 1
+                    dependents[dep].append(node)
+                    
+        ready = deque(node for node, count in indegree.items() if count == 0)
+        order = []
         
-        def visit(node: str) -> None:
-            if node in visited:
-                return
-            visited.add(node)
-            
-            for dep in graph.get(node, []):
-                if dep in graph:  # Only visit if dependency exists
-                    visit(dep)
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for dependent in dependents.get(node, ()):
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
                     
-            stack.append(node)
+        if len(order) != len(graph):
+            cyclic = [node for node in graph if indegree[node] > 0]
+            logger.warning(f"Circular plugin dependencies detected: {cyclic}")
+            # Still load them, after everything they could be ordered against
+            order.extend(cyclic)
             
-        for node in graph:
-            visit(node)
-            
-        return stack
+        return order
         
     async def _initialize_plugins(self) -> None:
         """Initialize plugins in dependency order"""
@@ -195,7 +247,19 @@ class PluginRegistry:
             except Exception as e:
                 logger.error(f"Failed to initialize plugin {plugin_name}: {e}")
                 # Remove failed plugin
-                del self._plugins[plugin_name]
+                self._unregister(plugin_name)
+                
+    def _unregister(self, name: str) -> None:
+        """Remove a plugin from the registry and its type buckets"""
+        plugin = self._plugins.pop(name)
+        for base_class in _plugin_bases(plugin.__class__):
+            self._by_type[base_class].pop(name, None)
+        self._invalidate_caches()
+        
+    def _invalidate_caches(self) -> None:
+        """Drop lookups derived from the loaded plugins"""
+        self._middleware_chains = None
+        self._operation_handlers.clear()
                 
     def get_plugin(self, name: str) -> Optional[BasePlugin]:
         """Get a specific plugin by name"""
@@ -203,23 +267,42 @@ class PluginRegistry:
         
     def get_plugins_by_type(self, plugin_type: Type[T]) -> List[T]:
         """Get all plugins of a specific type"""
-        plugin_names = self._plugin_types.get(plugin_type, [])
-        return [self._plugins[name] for name in plugin_names if name in self._plugins]
+        plugins = self._by_type.get(plugin_type)
+        return list(plugins.values()) if plugins else []
         
     def get_operation_handlers(self, tool_name: str) -> Dict[str, BaseOperationHandler]:
-        """Get all operation handlers for a specific tool"""
-        handlers = {}
+        """
+        Get all operation handlers for a specific tool.
         
-        for plugin in self.get_plugins_by_type(OperationPlugin):
-            if plugin.get_tool_name() == tool_name:
-                handlers.update(plugin.get_operations())
-                
-        return handlers
+        Handlers are collected once per tool and reused until plugins are
+        loaded or removed. Callers get their own copy of the mapping.
+        """
+        handlers = self._operation_handlers.get(tool_name)
+        if handlers is None:
+            handlers = {}
+            for plugin in self.get_plugins_by_type(OperationPlugin):
+                if plugin.get_tool_name() == tool_name:
+                    handlers.update(plugin.get_operations())
+            self._operation_handlers[tool_name] = handlers
+            
+        return dict(handlers)
         
-    def get_middleware_chain(self) -> List[MiddlewarePlugin]:
+    def get_middleware_chain(self) -> Tuple[MiddlewarePlugin, ...]:
         """Get middleware plugins sorted by priority"""
-        middleware = self.get_plugins_by_type(MiddlewarePlugin)
-        return sorted(middleware, key=lambda m: m.get_priority())
+        return self.get_middleware_chains()[0]
+        
+    def get_middleware_chains(self) -> Tuple[Tuple[MiddlewarePlugin, ...], Tuple[MiddlewarePlugin, ...]]:
+        """
+        Get the middleware chains for requests and responses.
+        
+        Requests run through middleware in priority order and responses in
+        reverse. Both are built once and reused until plugins are loaded or removed.
+        """
+        if self._middleware_chains is None:
+            middleware = self.get_plugins_by_type(MiddlewarePlugin)
+            request_chain = tuple(sorted(middleware, key=lambda m: m.get_priority()))
+            self._middleware_chains = (request_chain, request_chain[::-1])
+        return self._middleware_chains
         
     def get_backend(self, backend_type: str, backend_name: str) -> Optional[BackendPlugin]:
         """Get a specific backend plugin"""
@@ -261,7 +344,8 @@ class PluginRegistry:
                     logger.error(f"Failed to unload plugin {plugin_name}: {e}")
                     
         self._plugins.clear()
-        self._plugin_types.clear()
+        self._by_type.clear()
+        self._invalidate_caches()
         self._load_order.clear()
         self._initialized = False
         
@@ -281,10 +365,7 @@ class PluginRegistry:
             await plugin.teardown()
             
             # Remove from registry
-            del self._plugins[name]
-            for plugin_list in self._plugin_types.values():
-                if name in plugin_list:
-                    plugin_list.remove(name)
+            self._unregister(name)
                     
             # Reload plugin class
             await self._load_plugin_class(plugin_class, config)
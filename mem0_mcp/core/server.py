@@ -10,22 +10,39 @@ Provides the core server with extensible architecture supporting:
 """
 
 import logging
-from typing import Any, Dict, List, Optional, Type
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Type
 import asyncio
 from mcp.server.fastmcp import FastMCP
 from mcp.server import Server
-from mem0 import MemoryClient, AsyncMemoryClient
 
 from .plugin_registry import PluginRegistry
 from .config_manager import ConfigManager, EnvConfigSource, FileConfigSource
 from .event_bus import EventBus, Event
 from .dependency_injection import Container, ServiceProvider
-from .base_plugin import BasePlugin, ToolPlugin, ExtensionPlugin
+from .base_plugin import BasePlugin, ToolPlugin, ExtensionPlugin, MiddlewareResponse
 from .base_operation import OperationContext
+from ..encoding import encode_json_stream
+
+if TYPE_CHECKING:
+    # mem0 pulls in its whole SDK; it is only imported once clients are created
+    from mem0 import MemoryClient, AsyncMemoryClient
 
 logger = logging.getLogger(__name__)
 
 
+async def _encode_streamed_result(result: Any) -> Any:
+    """
+    Encode a streaming operation result as `{..., "results": [...]}` JSON text.
+
+    Items are serialized as the generator yields them, so the full list of
+    result objects is never held in memory.
+    """
+    if not (isinstance(result, dict) and result.get("stream") and "generator" in result):
+        return result
+    head = {key: value for key, value in result.items() if key not in ("stream", "generator")}
+    return await encode_json_stream(head, "results", result["generator"])
+
+
 class Mem0MCPServer:
     """
     Main server class for the Mem0 MCP implementation.
@@ -50,8 +67,8 @@ class Mem0MCPServer:
         self.service_provider = ServiceProvider(self.container)
         
         # Clients
-        self.sync_client: Optional[MemoryClient] = None
-        self.async_client: Optional[AsyncMemoryClient] = None
+        self.sync_client: Optional["MemoryClient"] = None
+        self.async_client: Optional["AsyncMemoryClient"] = None
         
         # Tool handlers
         self._tool_handlers: Dict[str, callable] = {}
@@ -96,6 +113,7 @@ class Mem0MCPServer:
         await self._initialize_clients()
         
         # Register clients in DI container
+        from mem0 import MemoryClient, AsyncMemoryClient
         if self.sync_client:
             self.container.register_instance(MemoryClient, self.sync_client)
         if self.async_client:
@@ -120,6 +138,8 @@ class Mem0MCPServer:
         
     async def _initialize_clients(self) -> None:
         """Initialize Mem0 clients"""
+        from mem0 import MemoryClient, AsyncMemoryClient
+        
         api_key = self.config_manager.get("api.key")
         if not api_key:
             raise ValueError("MEM0_API_KEY not found in configuration")
@@ -197,15 +217,22 @@ class Mem0MCPServer:
                 session_id=kwargs.get("session_id")
             )
             
-            # Apply middleware
-            for middleware in self.plugin_registry.get_middleware_chain():
-                kwargs = await middleware.process_request(tool_name, "execute", kwargs)
-                
-            # Execute tool
-            result = await plugin.execute(**kwargs)
+            request_chain, response_chain = self.plugin_registry.get_middleware_chains()
+            
+            # Apply middleware; any of it may answer the request itself
+            for index, middleware in enumerate(request_chain):
+                processed = await middleware.process_request(tool_name, "execute", kwargs)
+                if isinstance(processed, MiddlewareResponse):
+                    result = processed.response
+                    response_chain = response_chain[len(request_chain) - index - 1:]
+                    break
+                kwargs = processed
+            else:
+                # Execute tool
+                result = await plugin.execute(**kwargs)
             
             # Apply middleware to response
-            for middleware in reversed(self.plugin_registry.get_middleware_chain()):
+            for middleware in response_chain:
                 result = await middleware.process_response(tool_name, "execute", result)
                 
             return result
@@ -250,15 +277,52 @@ class Mem0MCPServer:
             builtin_ops = tool_module.get_builtin_operations()
             operation_handlers.update(builtin_ops)
             
+        # One specialized runner per operation, so a call is a single lookup
+        operation_runners = {
+            operation: self._make_operation_runner(tool_name, operation, handler)
+            for operation, handler in operation_handlers.items()
+        }
+        
         # Create main tool handler
         async def tool_handler(**kwargs):
             operation = kwargs.get("operation")
-            if not operation:
-                return {"error": "Operation parameter is required"}
-                
-            if operation not in operation_handlers:
+            runner = operation_runners.get(operation)
+            if runner is None:
+                if not operation:
+                    return {"error": "Operation parameter is required"}
                 return {"error": f"Unknown operation: {operation}"}
                 
+            return await runner(kwargs)
+            
+        # Set function name to avoid MCP warnings
+        tool_handler.__name__ = f"{tool_name}_handler"
+        
+        # Register with MCP
+        self.mcp.tool(
+            description=tool_description
+        )(tool_handler)
+        
+        # Store handler reference
+        self._tool_handlers[tool_name] = tool_handler
+        
+        logger.info(f"Registered tool: {tool_name} with {len(operation_handlers)} operations")
+        
+    def _make_operation_runner(
+        self,
+        tool_name: str,
+        operation: str,
+        handler: Callable[..., Awaitable[Any]]
+    ) -> Callable[[Dict[str, Any]], Awaitable[Any]]:
+        """Build the call path for one tool operation, with its handler and event name bound"""
+        event_name = f"tool.{tool_name}.{operation}"
+        # Operation handlers are usually objects with an async __call__
+        is_async = asyncio.iscoroutinefunction(handler) or asyncio.iscoroutinefunction(
+            getattr(handler, "__call__", None)
+        )
+        plugin_registry = self.plugin_registry
+        event_bus = self.event_bus
+        
+        async def run(kwargs: Dict[str, Any]) -> Any:
             # Create context
             context = OperationContext(
                 tool_name=tool_name,
@@ -267,41 +331,45 @@ class Mem0MCPServer:
                 session_id=kwargs.get("session_id")
             )
             
-            # Apply middleware
-            for middleware in self.plugin_registry.get_middleware_chain():
-                kwargs = await middleware.process_request(tool_name, operation, kwargs)
-                
-            # Get handler
-            handler = operation_handlers[operation]
-            
-            # Execute operation
-            result = await handler(context, **kwargs)
+            request_chain, response_chain = plugin_registry.get_middleware_chains()
             
+            # Apply middleware; any of it may answer the request itself (e.g. a cache
+            # hit), in which case only the middleware that saw the request unwinds
+            for index, middleware in enumerate(request_chain):
+                processed = await middleware.process_request(tool_name, operation, kwargs)
+                if isinstance(processed, MiddlewareResponse):
+                    result = processed.response
+                    response_chain = response_chain[len(request_chain) - index - 1:]
+                    break
+                kwargs = processed
+            else:
+                # Execute operation; sync handlers run in a worker thread so they don't block the loop
+                if is_async:
+                    result = await handler(context, **kwargs)
+                else:
+                    result = await asyncio.to_thread(handler, context, **kwargs)
+                
             # Apply middleware to response
-            for middleware in reversed(self.plugin_registry.get_middleware_chain()):
+            for middleware in response_chain:
                 result = await middleware.process_response(tool_name, operation, result)
                 
-            # Emit event
-            await self.event_bus.emit(f"tool.{tool_name}.{operation}", {
+            # Streamed results (stream=True) are encoded incrementally rather than collected
+            result = await _encode_streamed_result(result)
+            
+            # Emit event; subscribers run on the bus worker, not before the response
+            payload = {
                 "params": kwargs,
                 "result": result,
                 "context": context
-            })
+            }
+            if event_bus.is_running:
+                await event_bus.emit_async(event_name, payload)
+            else:
+                await event_bus.emit(event_name, payload)
             
             return result
             
-        # Set function name to avoid MCP warnings
-        tool_handler.__name__ = f"{tool_name}_handler"
-        
-        # Register with MCP
-        self.mcp.tool(
-            description=tool_description
-        )(tool_handler)
-        
-        # Store handler reference
-        self._tool_handlers[tool_name] = tool_handler
-        
-        logger.info(f"Registered tool: {tool_name} with {len(operation_handlers)} operations")
+        return run
         
     async def start(self) -> None:
         """Start the server"""
@@ -341,6 +409,19 @@ class Mem0MCPServer:
         if self.async_client and hasattr(self.async_client, 'close'):
             await self.async_client.close()
             
+    async def call_tool(self, tool_name: str, **kwargs) -> Any:
+        """
+        Call a registered tool in-process.
+        
+        Awaits the tool handler directly, with the same middleware and events as
+        an MCP call but without the protocol round-trip. Meant for extension
+        plugins that build on other tools.
+        """
+        handler = self._tool_handlers.get(tool_name)
+        if handler is None:
+            raise ValueError(f"Unknown tool: {tool_name}")
+        return await handler(**kwargs)
+        
     def get_mcp_server(self) -> Server:
         """Get the underlying MCP server instance"""
         return self.mcp._mcp_server
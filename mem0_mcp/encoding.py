@@ -0,0 +1,170 @@
+"""
+Response Encoding
+
+Serializers shared by the FastMCP entry points for tool responses:
+- Compact JSON (orjson when installed, stdlib json otherwise), plus the matching parser
+- TOON, a tabular text format that states field names once per table
+- MessagePack, base64-encoded so it can travel over the SSE text stream
+"""
+
+import base64
+import dataclasses
+import json
+from typing import Any, AsyncIterable, Dict, List, Literal, Optional, Sequence, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import ormsgpack
+except ImportError:
+    ormsgpack = None
+
+ResponseFormat = Literal["json", "toon", "msgpack"]
+
+# TOON only pays off on bulk tabular data; smaller results stay JSON
+TOON_MIN_ROWS = 8
+
+_TOON_SPECIAL = set(',:"\\[]{}\n\r\t')
+_TOON_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback for the stdlib encoder; orjson handles dataclasses natively"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    return str(obj)
+
+
+def dump_json(obj: Any, pretty: bool = False) -> str:
+    """Serialize an object (dataclass rows included) to a compact, or 2-space indented, JSON string"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option).decode()
+    if pretty:
+        return json.dumps(obj, indent=2, default=_json_default)
+    return json.dumps(obj, separators=(",", ":"), default=_json_default)
+
+
+def load_json(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or bytes; raises json.JSONDecodeError (orjson's subclasses it) on bad input"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+async def encode_json_stream(head: Dict[str, Any], name: str, rows: AsyncIterable[Any]) -> str:
+    """
+    Encode `{**head, name: [*rows]}` as JSON, serializing rows as they arrive.
+
+    Rows are never collected into an intermediate list; each one is encoded
+    as soon as the iterator yields it.
+    """
+    opening = dump_json(head)[:-1]
+    chunks = [f"{opening}{',' if head else ''}{dump_json(name)}:["]
+    separator = ""
+    async for row in rows:
+        chunks.append(separator)
+        chunks.append(dump_json(row))
+        separator = ","
+    chunks.append("]}")
+    return "".join(chunks)
+
+
+def _toon_value(value: Any) -> str:
+    """Encode a single TOON cell"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if not isinstance(value, str):
+        # Nested structures have no tabular form; embed them as JSON text
+        value = dump_json(value)
+
+    if (not value or value != value.strip() or value in ("true", "false", "null")
+            or _TOON_SPECIAL.intersection(value) or _looks_numeric(value)):
+        return f'"{value.translate(_TOON_ESCAPES)}"'
+    return value
+
+
+def _looks_numeric(value: str) -> bool:
+    """Check if a string would be read back as a number"""
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _collect_columns(rows: Sequence[Any]) -> List[str]:
+    """Union of row keys in first-seen order; dataclass rows use their field names"""
+    if rows and dataclasses.is_dataclass(rows[0]):
+        return [field.name for field in dataclasses.fields(rows[0])]
+    columns: Dict[str, None] = {}
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    return list(columns)
+
+
+def _row_values(row: Any, columns: Sequence[str]) -> List[Any]:
+    """Cell values of a dict or dataclass row in column order"""
+    if isinstance(row, dict):
+        return [row.get(column) for column in columns]
+    return [getattr(row, column, None) for column in columns]
+
+
+def encode_toon(
+    name: str,
+    rows: Sequence[Any],
+    columns: Optional[Sequence[str]] = None,
+    fields: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Encode rows as a TOON table.
+
+    Args:
+        name: Table name used in the header
+        rows: Uniform dict or dataclass rows to encode
+        columns: Column order; defaults to the union of row keys
+        fields: Optional scalar fields emitted as `key: value` lines before the table
+    """
+    columns = list(columns) if columns else _collect_columns(rows)
+    lines = [f"{key}: {_toon_value(value)}" for key, value in (fields or {}).items()]
+    lines.append(f"{name}[{len(rows)}]{{{','.join(columns)}}}:")
+    lines.extend(
+        "  " + ",".join(_toon_value(value) for value in _row_values(row, columns))
+        for row in rows
+    )
+    return "\n".join(lines)
+
+
+def encode_msgpack(obj: Any) -> str:
+    """Encode an object as base64 MessagePack"""
+    if ormsgpack is None:
+        raise ValueError("msgpack response format requires the 'ormsgpack' package")
+    return base64.b64encode(ormsgpack.packb(obj, option=ormsgpack.OPT_NON_STR_KEYS)).decode("ascii")
+
+
+def encode_rows(
+    name: str,
+    rows: Sequence[Any],
+    response_format: ResponseFormat,
+    payload: Any,
+    columns: Optional[Sequence[str]] = None,
+    fields: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Encode a list-returning tool response in the requested format.
+
+    `payload` is the full response object used for JSON and MessagePack;
+    TOON encodes `rows` (plus scalar `fields`) directly.
+    """
+    if response_format == "msgpack":
+        return encode_msgpack(payload)
+    if response_format == "toon" and len(rows) >= TOON_MIN_ROWS:
+        return encode_toon(name, rows, columns, fields)
+    return dump_json(payload)
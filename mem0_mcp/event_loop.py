@@ -0,0 +1,34 @@
+"""
+Event Loop Selection
+
+Swaps the default asyncio loop for a libuv-backed one when available.
+"""
+
+import asyncio
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+def install_fast_event_loop() -> bool:
+    """
+    Install uvloop (winloop on Windows) as the asyncio event loop policy.
+
+    Must be called before the server starts its loop. Falls back to the
+    stock asyncio loop when the package is not installed.
+
+    Returns:
+        True if a faster loop was installed
+    """
+    try:
+        if sys.platform == "win32":
+            import winloop as loop_impl
+        else:
+            import uvloop as loop_impl
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(loop_impl.EventLoopPolicy())
+    logger.info(f"Using {loop_impl.__name__} event loop")
+    return True
@@ -3,27 +3,41 @@ Built-in Plugins for Mem0 MCP Server
 
 This package contains built-in plugins that demonstrate the extensibility
 of the Mem0 MCP Server architecture.
+
+Plugin modules are imported on first use rather than with the package.
 """
 
-from typing import List, Type
+import importlib
+from functools import lru_cache
+from typing import Any, List, Tuple, Type
 from ..core.base_plugin import BasePlugin
 
-# Import built-in plugins
-from .logging_middleware import LoggingMiddlewarePlugin
-from .cache_plugin import CachePlugin
-from .neo4j_backend import Neo4jBackendPlugin
-from .batch_operations import BatchOperationsPlugin
-from .feedback_operations import FeedbackOperationsPlugin
-from .history_operations import HistoryOperationsPlugin
+# Built-in plugin class name -> defining submodule, in load order
+_BUILTIN_PLUGINS = {
+    "LoggingMiddlewarePlugin": ".logging_middleware",
+    "CachePlugin": ".cache_plugin",
+    "Neo4jBackendPlugin": ".neo4j_backend",
+    "BatchOperationsPlugin": ".batch_operations",
+    "FeedbackOperationsPlugin": ".feedback_operations",
+    "HistoryOperationsPlugin": ".history_operations",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a built-in plugin class when it is first accessed"""
+    module_name = _BUILTIN_PLUGINS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    plugin_class = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = plugin_class
+    return plugin_class
+
+
+@lru_cache(maxsize=1)
+def _load_builtin_plugins() -> Tuple[Type[BasePlugin], ...]:
+    return tuple(__getattr__(name) for name in _BUILTIN_PLUGINS)
 
 
 def get_builtin_plugins() -> List[Type[BasePlugin]]:
     """Get list of built-in plugin classes"""
-    return [
-        LoggingMiddlewarePlugin,
-        CachePlugin,
-        Neo4jBackendPlugin,
-        BatchOperationsPlugin,
-        FeedbackOperationsPlugin,
-        HistoryOperationsPlugin
-    ]
\ No newline at end of file
+    return list(_load_builtin_plugins())
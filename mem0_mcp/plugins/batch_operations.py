@@ -4,14 +4,21 @@ Batch Operations Plugin
 Adds batch operation support to the mem0_memory tool.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 from ..core.base_plugin import OperationPlugin, PluginMetadata
-from ..core.base_operation import BatchOperationHandler, OperationMetadata, ParameterDefinition, ParameterType, OperationContext
+from ..core.base_operation import BatchChunkResult, BatchOperationHandler, OperationMetadata, ParameterDefinition, ParameterType, OperationContext
+
+
+# Most memories the mem0 batch endpoints accept per request
+MEM0_BATCH_LIMIT = 1000
 
 
 class BatchUpdateOperation(BatchOperationHandler):
     """Handler for batch memory updates"""
     
+    batch_size = MEM0_BATCH_LIMIT
+    items_param = "memories"
+    
     @property
     def metadata(self) -> OperationMetadata:
         return OperationMetadata(
@@ -22,34 +29,44 @@ class BatchUpdateOperation(BatchOperationHandler):
             ]
         )
         
-    async def execute_batch(self, context: OperationContext, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Execute batch update"""
-        from mem0 import AsyncMemoryClient
+    async def _execute_chunk(
+        self, context: OperationContext, chunk: List[Dict[str, Any]]
+    ) -> Union[List[Dict[str, Any]], BatchChunkResult]:
+        """Update a chunk of memories with one batch request"""
+        client = context.metadata["client"]
+        
+        try:
+            result = await client.batch_update([
+                {"memory_id": item["memory_id"], "text": item["data"]} for item in chunk
+            ])
+        except Exception as e:
+            return [
+                {"status": "error", "memory_id": item.get("memory_id"), "error": str(e)}
+                for item in chunk
+            ]
+            
+        # The bulk response covers the whole chunk, so it is reported once rather than per memory
+        return BatchChunkResult(
+            items=[{"status": "success", "memory_id": item["memory_id"]} for item in chunk],
+            response=result
+        )
+        
+    def _use_chunks(self, context: OperationContext) -> bool:
+        """Clients without the bulk endpoint get one bounded request per memory"""
+        return hasattr(context.metadata.get("client"), "batch_update")
+        
+    async def _execute_item(self, context: OperationContext, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Update a single memory"""
         client = context.metadata.get("client")
         
         if not client:
-            return [{"error": "Memory client not initialized"} for _ in items]
+            return {"error": "Memory client not initialized"}
             
-        results = []
-        for item in items:
-            try:
-                result = await client.update(
-                    memory_id=item["memory_id"],
-                    data=item["data"]
-                )
-                results.append({
-                    "status": "success",
-                    "memory_id": item["memory_id"],
-                    "data": result
-                })
-            except Exception as e:
-                results.append({
-                    "status": "error",
-                    "memory_id": item.get("memory_id"),
-                    "error": str(e)
-                })
-                
-        return results
+        try:
+            result = await client.update(item["memory_id"], item["data"])
+        except Exception as e:
+            return {"status": "error", "memory_id": item.get("memory_id"), "error": str(e)}
+        return {"status": "success", "memory_id": item["memory_id"], "data": result}
         
     async def execute_single(self, context: OperationContext, **params) -> Dict[str, Any]:
         """Not used for batch operations"""
@@ -59,6 +76,9 @@ class BatchUpdateOperation(BatchOperationHandler):
 class BatchDeleteOperation(BatchOperationHandler):
     """Handler for batch memory deletion"""
     
+    batch_size = MEM0_BATCH_LIMIT
+    items_param = "memory_ids"
+    
     @property
     def metadata(self) -> OperationMetadata:
         return OperationMetadata(
@@ -69,36 +89,46 @@ class BatchDeleteOperation(BatchOperationHandler):
             ]
         )
         
-    async def execute_batch(self, context: OperationContext, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Execute batch delete"""
-        from mem0 import AsyncMemoryClient
+    async def _execute_chunk(
+        self, context: OperationContext, chunk: List[Any]
+    ) -> Union[List[Dict[str, Any]], BatchChunkResult]:
+        """Delete a chunk of memories with one batch request"""
+        client = context.metadata["client"]
+        
+        # Items may be plain IDs or {"memory_id": ...} objects
+        memory_ids = [item.get("memory_id") if isinstance(item, dict) else item for item in chunk]
+        
+        try:
+            result = await client.batch_delete([{"memory_id": memory_id} for memory_id in memory_ids])
+        except Exception as e:
+            return [
+                {"status": "error", "memory_id": memory_id, "error": str(e)}
+                for memory_id in memory_ids
+            ]
+            
+        # The bulk response covers the whole chunk, so it is reported once rather than per memory
+        return BatchChunkResult(
+            items=[{"status": "success", "memory_id": memory_id} for memory_id in memory_ids],
+            response=result
+        )
+        
+    def _use_chunks(self, context: OperationContext) -> bool:
+        """Clients without the bulk endpoint get one bounded request per memory"""
+        return hasattr(context.metadata.get("client"), "batch_delete")
+        
+    async def _execute_item(self, context: OperationContext, item: Any) -> Dict[str, Any]:
+        """Delete a single memory"""
         client = context.metadata.get("client")
         
         if not client:
-            return [{"error": "Memory client not initialized"} for _ in items]
-            
-        # If items is a list of IDs, convert to proper format
-        if items and isinstance(items[0], str):
-            items = [{"memory_id": id} for id in items]
+            return {"error": "Memory client not initialized"}
             
-        results = []
-        for item in items:
-            try:
-                memory_id = item.get("memory_id") if isinstance(item, dict) else item
-                result = await client.delete(memory_id=memory_id)
-                results.append({
-                    "status": "success",
-                    "memory_id": memory_id,
-                    "data": result
-                })
-            except Exception as e:
-                results.append({
-                    "status": "error",
-                    "memory_id": item.get("memory_id") if isinstance(item, dict) else item,
-                    "error": str(e)
-                })
-                
-        return results
+        memory_id = item.get("memory_id") if isinstance(item, dict) else item
+        try:
+            result = await client.delete(memory_id)
+        except Exception as e:
+            return {"status": "error", "memory_id": memory_id, "error": str(e)}
+        return {"status": "success", "memory_id": memory_id, "data": result}
         
     async def execute_single(self, context: OperationContext, **params) -> Dict[str, Any]:
         """Not used for batch operations"""
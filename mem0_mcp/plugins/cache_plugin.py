@@ -6,12 +6,44 @@ Provides caching capabilities for memory operations.
 
 import asyncio
 import hashlib
+import heapq
 import json
-from typing import Any, Dict, Optional
-from ..core.base_plugin import MiddlewarePlugin, PluginMetadata
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple, Union
+from ..core.base_plugin import MiddlewarePlugin, MiddlewareResponse, PluginMetadata
+
+try:
+    import orjson
+except ImportError:  # optional speedups; cache keys fall back to stdlib json + md5
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Request fields that vary between otherwise identical calls
+_UNCACHED_PARAMS = frozenset({"session_id"})
+
+# (tool, operation, user scope, cache key or None for writes, cache generation)
+# for the request in flight in this task, handed from process_request to process_response
+_pending: ContextVar[Optional[Tuple[str, str, Optional[str], Optional[str], Tuple[int, int]]]] = ContextVar(
+    "cache_plugin_pending", default=None
+)
 
 class CachePlugin(MiddlewarePlugin):
-    """Middleware that caches memory operation results"""
+    """
+    Middleware that caches memory operation results.
+    
+    A cache hit answers the request without calling mem0. Any operation that
+    is not cacheable is treated as a write and invalidates the cached results
+    for its user, or all cached results when it is not scoped to a user.
+    
+    Responses are cached as-is, without copying, so they must not be mutated
+    after they are returned. Cache hits are returned as new dicts.
+    """
     
     @property
     def metadata(self) -> PluginMetadata:
@@ -33,9 +65,17 @@ class CachePlugin(MiddlewarePlugin):
         
     async def setup(self) -> None:
         """Initialize cache"""
-        self.cache: Dict[str, tuple[float, Any]] = {}
+        # key -> (cached_at, generation, result), least recently used first
+        self.cache: "OrderedDict[str, Tuple[float, Tuple[int, int], Any]]" = OrderedDict()
+        # (expires_at, key) per insert; entries re-cached or evicted since are skipped on pop
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # Write counters; an entry is only valid while both still match what it was cached under
+        self._epoch = 0
+        self._user_epochs: Dict[Optional[str], int] = {}
         self.ttl = self.config.get("ttl", 300)
         self.max_size = self.config.get("max_size", 1000)
+        # Plain monotonic clock; no event loop lookup per cache access
+        self._now = time.monotonic
         self.cacheable_operations = set(self.config.get("cacheable_operations", ["search", "get", "get_all"]))
         
         # Start cleanup task
@@ -50,84 +90,122 @@ class CachePlugin(MiddlewarePlugin):
             except asyncio.CancelledError:
                 pass
                 
-    async def process_request(self, tool_name: str, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Check cache for cached results"""
+    async def process_request(self, tool_name: str, operation: str, params: Dict[str, Any]) -> Union[Dict[str, Any], MiddlewareResponse]:
+        """Answer cacheable requests from the cache; invalidate on writes"""
+        user_id = params.get("user_id")
+        
         if operation not in self.cacheable_operations:
+            self._invalidate(user_id)
+            _pending.set((tool_name, operation, user_id, None, self._generation(user_id)))
             return params
             
         cache_key = self._get_cache_key(tool_name, operation, params)
+        generation = self._generation(user_id)
         
         # Check cache
-        if cache_key in self.cache:
-            timestamp, cached_result = self.cache[cache_key]
-            if asyncio.get_event_loop().time() - timestamp < self.ttl:
-                # Return cached result
-                params["_cached_result"] = cached_result
-                params["_from_cache"] = True
-                
-        params["_cache_key"] = cache_key
+        entry = self.cache.get(cache_key)
+        if entry is not None:
+            cached_at, cached_generation, result = entry
+            if cached_generation == generation and self._now() - cached_at < self.ttl:
+                self.cache.move_to_end(cache_key)
+                _pending.set(None)
+                return MiddlewareResponse({**result, "_cached": True})
+            # Expired or written since; drop it now rather than waiting for the cleanup loop
+            del self.cache[cache_key]
+            
+        # Params pass through untouched; the key travels in the task's context
+        _pending.set((tool_name, operation, user_id, cache_key, generation))
         return params
         
     async def process_response(self, tool_name: str, operation: str, response: Dict[str, Any]) -> Dict[str, Any]:
         """Cache successful responses"""
-        # If result was from cache, return it
-        if response.get("_from_cache"):
-            cached_result = response.pop("_cached_result")
-            response.pop("_from_cache")
-            response.pop("_cache_key", None)
-            return {**cached_result, "_cached": True}
+        pending = _pending.get()
+        if pending is None or pending[0] != tool_name or pending[1] != operation:
+            return response
+        _pending.set(None)
+        _, _, user_id, cache_key, generation = pending
+        
+        if cache_key is None:
+            # Write finished; reads that started while it ran may have seen either state
+            self._invalidate(user_id)
+            return response
             
-        # Cache new results
-        if operation in self.cacheable_operations and response.get("status") == "success":
-            cache_key = response.pop("_cache_key", None)
-            if cache_key:
-                # Ensure cache size limit
-                if len(self.cache) >= self.max_size:
-                    # Remove oldest entry
-                    oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k][0])
-                    del self.cache[oldest_key]
-                    
-                # Cache result
-                self.cache[cache_key] = (asyncio.get_event_loop().time(), response.copy())
+        # Cache new results, unless a write for this scope happened since the request
+        if (
+            isinstance(response, dict)
+            and response.get("status") == "success"
+            and generation == self._generation(user_id)
+        ):
+            # Ensure cache size limit
+            if cache_key not in self.cache and len(self.cache) >= self.max_size:
+                # Remove least recently used entry
+                self.cache.popitem(last=False)
                 
+            # Cache result
+            now = self._now()
+            self.cache[cache_key] = (now, generation, response)
+            self.cache.move_to_end(cache_key)
+            heapq.heappush(self._expiry_heap, (now + self.ttl, cache_key))
+            
         return response
         
+    def _generation(self, user_id: Optional[str]) -> Tuple[int, int]:
+        """Write counters that cached results for this user were read under"""
+        return (self._epoch, self._user_epochs.get(user_id, 0))
+        
+    def _invalidate(self, user_id: Optional[str]) -> None:
+        """Invalidate cached results a write for this user could have changed"""
+        if user_id is None:
+            # Unscoped writes can touch anyone's memories
+            self._epoch += 1
+        else:
+            # Results read without a user (e.g. by memory id) may include this user's memories
+            for scope in (user_id, None):
+                self._user_epochs[scope] = self._user_epochs.get(scope, 0) + 1
+                
     def get_priority(self) -> int:
         """Medium priority"""
         return 50
         
     def _get_cache_key(self, tool_name: str, operation: str, params: Dict[str, Any]) -> str:
         """Generate cache key from parameters"""
-        # Remove non-deterministic fields
-        cache_params = {k: v for k, v in params.items() 
-                       if not k.startswith("_") and k not in ["session_id"]}
-        
-        cache_data = {
-            "tool": tool_name,
-            "operation": operation,
-            "params": cache_params
-        }
+        # Remove non-deterministic fields; sorted pairs keep argument order out of the key
+        cache_params = sorted(
+            (k, v) for k, v in params.items()
+            if not k.startswith("_") and k not in _UNCACHED_PARAMS
+        )
+        cache_data = (tool_name, operation, cache_params)
         
-        # Generate hash
-        cache_str = json.dumps(cache_data, sort_keys=True)
-        return hashlib.md5(cache_str.encode()).hexdigest()
+        # Nested dicts are sorted by the encoder
+        if orjson is not None:
+            encoded = orjson.dumps(cache_data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+        else:
+            encoded = json.dumps(cache_data, sort_keys=True, default=str).encode()
+            
+        # The key is not security sensitive, so a fast non-cryptographic hash is enough
+        if xxhash is not None:
+            return xxhash.xxh3_128_hexdigest(encoded)
+        return hashlib.md5(encoded).hexdigest()
         
     async def _cleanup_loop(self) -> None:
-        """Periodically clean up expired cache entries"""
+        """Drop cache entries as they expire"""
         while True:
             try:
-                await asyncio.sleep(60)  # Check every minute
-                
-                current_time = asyncio.get_event_loop().time()
-                expired_keys = [
-                    key for key, (timestamp, _) in self.cache.items()
-                    if current_time - timestamp > self.ttl
-                ]
+                # Every entry lives for the same TTL, so nothing inserted later can
+                # expire before the current earliest one; sleep until that moment
+                heap = self._expiry_heap
+                delay = heap[0][0] - self._now() if heap else self.ttl
+                await asyncio.sleep(max(delay, 0))
                 
-                for key in expired_keys:
-                    del self.cache[key]
-                    
+                current_time = self._now()
+                while heap and heap[0][0] <= current_time:
+                    expires_at, key = heapq.heappop(heap)
+                    entry = self.cache.get(key)
+                    # Skip keys evicted or re-cached since this heap entry was pushed
+                    if entry is not None and entry[0] + self.ttl == expires_at:
+                        del self.cache[key]
+                        
             except asyncio.CancelledError:
                 break
             except Exception:
-                pass  # Continue cleanup loop
\ No newline at end of file
+                pass  # Continue cleanup loop
@@ -210,15 +210,19 @@ class AnalyzeMemoriesOperation(BaseOperationHandler):
         topics = defaultdict(int)
         word_freq = Counter()
         
+        # Bound once so the loop body is only C-level bulk updates
+        count_categories = categories.update
+        count_words = word_freq.update
+        find_words = re.compile(r'\b\w+\b').findall
+        
         for memory in memories:
             # Categories
-            for cat in memory.get("categories", []):
-                categories[cat] += 1
+            memory_categories = memory.get("categories")
+            if memory_categories:
+                count_categories(memory_categories)
                 
             # Extract topics/keywords
-            text = memory.get("memory", "")
-            words = re.findall(r'\b\w+\b', text.lower())
-            word_freq.update(words)
+            count_words(find_words(memory.get("memory", "").lower()))
             
         # Get top patterns
         return {